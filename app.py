@@ -5,8 +5,21 @@ from datetime import datetime
 import logging
 import requests
 import json
+import copy
+import re
+import secrets
+import threading
+import time
+import numpy as np
 from dotenv import load_dotenv
 
+from cache import create_cache
+from geo import GridIndex, resolve_location
+from jsonprovider import FastJSONProvider, encode_entry, entry_response
+from prefetch import Prefetcher
+from profiler import init_profiling
+from upstream import ReplicaPool
+
 # Load environment variables
 load_dotenv()
 
@@ -14,6 +27,7 @@ load_dotenv()
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['DEBUG'] = os.environ.get('FLASK_DEBUG', 'True') == 'True'
+app.json = FastJSONProvider(app)
 
 # Enable CORS
 CORS(app, supports_credentials=True)
@@ -23,12 +37,201 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Microservice URLs - PRODUCTION (VM Deployment)
-USER_SERVICE_URL = os.environ.get('USER_SERVICE_URL', 'http://34.9.57.25:3001')
+# USER_SERVICE_URL may list several comma-separated replicas; requests are
+# balanced across them client-side
+USER_SERVICE_URLS = [url.strip() for url in
+                     os.environ.get('USER_SERVICE_URL', 'http://34.9.57.25:3001').split(',')
+                     if url.strip()]
+USER_SERVICE_URL = USER_SERVICE_URLS[0]
 COMPOSITE_SERVICE_URL = os.environ.get('COMPOSITE_SERVICE_URL', 'http://localhost:3002')
 
-logger.info(f"Using PRODUCTION User Service at: {USER_SERVICE_URL}")
+# Cache shared by the stats view and walker candidates. 'sqlite' keeps it in a
+# file every worker on the host can read; 'memory' is per process.
+cache = create_cache(
+    os.environ.get('CACHE_BACKEND', 'memory'),
+    path=os.environ.get('CACHE_PATH'),
+    max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', 0)) or None
+)
+
+# Replica pool for the user service. UPSTREAM_BALANCE_POLICY is
+# 'peak_ewma' or 'least_outstanding'; set UPSTREAM_HEALTH_INTERVAL to probe
+# replicas in the background as well as from /api/health.
+# UPSTREAM_ASYNC_MAX_CONNECTIONS caps the asyncio mode's connections per
+# event loop; 0 means no cap.
+user_service = ReplicaPool(
+    USER_SERVICE_URLS,
+    policy=os.environ.get('UPSTREAM_BALANCE_POLICY', 'peak_ewma'),
+    max_failures=int(os.environ.get('UPSTREAM_MAX_FAILURES', 3)),
+    eject_seconds=int(os.environ.get('UPSTREAM_EJECT_SECONDS', 30)),
+    health_interval=int(os.environ.get('UPSTREAM_HEALTH_INTERVAL', 0)),
+    async_max_connections=int(os.environ.get('UPSTREAM_ASYNC_MAX_CONNECTIONS', 0)) or None
+)
+
+# Opt-in request profiling: send X-Profile: <PROFILE_TOKEN>, or sample a
+# fraction of requests with PROFILE_SAMPLE_RATE. Off (no hooks) by default.
+init_profiling(
+    app,
+    pool=user_service,
+    directory=os.environ.get('PROFILE_DIR', 'profiles'),
+    token=os.environ.get('PROFILE_TOKEN'),
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+    interval_ms=float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+)
+
+# Set USER_SERVICE_SUPPORTS_FIELDS=True when the user service honours ?fields=
+USER_SERVICE_SUPPORTS_FIELDS = os.environ.get('USER_SERVICE_SUPPORTS_FIELDS', 'False') == 'True'
+
+logger.info(f"Using PRODUCTION User Service at: {', '.join(USER_SERVICE_URLS)}")
 logger.info(f"Swagger UI available at: {USER_SERVICE_URL}/api-docs")
 
+# ==================== FIELD SELECTION ====================
+
+# Response fields each list endpoint can return, mapped to the user service
+# field they come from (None for fields computed here)
+WALKER_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'rating': 'rating',
+    'reviews': 'total_reviews',
+    'location': 'location',
+    'bio': 'bio',
+    'price': 'price',
+    'availability': None,
+    'distance_km': None
+}
+PET_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'type': None,
+    'breed': 'breed',
+    'age': 'age',
+    'size': 'size',
+    'temperament': 'temperament',
+    'energy_level': 'energy_level'
+}
+PROFILE_SECTIONS = ('user', 'dogs', 'stats')
+
+
+def _requested_fields(allowed=None, args=None):
+    """Parse ?fields=a,b,c into a set, or None when absent.
+    
+    Raises ValueError naming any field not in allowed.
+    """
+    raw = (request.args if args is None else args).get('fields')
+    if not raw:
+        return None
+    fields = {f.strip() for f in raw.split(',') if f.strip()}
+    if allowed is not None:
+        unknown = sorted(fields - set(allowed))
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    return fields
+
+
+def _requested_profile_fields(args=None):
+    """Parse /api/profile ?fields= into {section: field set or None}, or None when absent"""
+    fields = _requested_fields(args=args)
+    if fields is None:
+        return None
+    sections = {}
+    for field in fields:
+        section, _, name = field.partition('.')
+        if section not in PROFILE_SECTIONS:
+            raise ValueError(f'Unknown fields: {field}. Use {", ".join(PROFILE_SECTIONS)} or section.field')
+        if not name:
+            sections[section] = None
+        elif section not in sections or sections[section] is not None:
+            sections.setdefault(section, set()).add(name)
+    return sections
+
+
+def _upstream_params(fields, mapping=None):
+    """Query params pushing a projection upstream, or None to fetch everything.
+    
+    mapping translates response field names to user service field names.
+    """
+    if fields is None or not USER_SERVICE_SUPPORTS_FIELDS:
+        return None
+    if mapping is not None:
+        fields = {mapping[f] for f in fields if mapping.get(f)}
+    return {'fields': ','.join(sorted(fields | {'id'}))}
+
+
+def _project(record, fields):
+    """Trim a dict to the requested fields"""
+    if fields is None:
+        return record
+    return {k: v for k, v in record.items() if k in fields}
+
+def _user_service_health(probe_results):
+    """Shape ReplicaPool.probe() results for /api/health"""
+    replicas = []
+    for url, (status, error) in probe_results.items():
+        replica = {'status': status, 'url': url, 'deployment': 'GCP VM'}
+        if error:
+            replica['error'] = error
+        replicas.append(replica)
+    
+    if len(replicas) == 1:
+        return replicas[0]
+    # Overall status is the best replica's: the balancer routes around the rest
+    statuses = {r['status'] for r in replicas}
+    return {
+        'status': next(st for st in ('healthy', 'unhealthy', 'unavailable') if st in statuses),
+        'url': USER_SERVICE_URLS,
+        'deployment': 'GCP VM',
+        'replicas': replicas
+    }
+
+# ==================== RESPONSE CACHE ====================
+
+# Successful responses from the read-heavy shared endpoints (stats, walker
+# lists) are cached as encoded bytes, plus a gzip copy of larger bodies, so
+# a hit skips both serialization and compression. RESPONSE_CACHE_TTL=0 disables it.
+# Responses get their own cache, same backend, so large bodies cannot evict
+# the stats view or prefetched working sets.
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 30))
+RESPONSE_GZIP_MIN_BYTES = int(os.environ.get('RESPONSE_GZIP_MIN_BYTES', 1024))
+# The stats response is cached per stats view version (STATS_RESPONSE_KEY#version)
+STATS_RESPONSE_KEY = '/api/stats'
+
+response_cache = create_cache(
+    os.environ.get('CACHE_BACKEND', 'memory'),
+    path=os.environ.get('RESPONSE_CACHE_PATH'),
+    max_entries=int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 256)),
+    name='responses'
+)
+
+
+def _response_cache_key(route, args):
+    """Cache key for a route and its query string, independent of parameter order"""
+    return f"{route}?{'&'.join(f'{k}={v}' for k, v in sorted(args.items(multi=True)))}"
+
+
+def _cached_response(key):
+    """The encoded entry cached under key, or None"""
+    if RESPONSE_CACHE_TTL <= 0:
+        return None
+    return response_cache.get('responses', key)
+
+
+def _store_response(key, payload, provider):
+    """Encode a successful payload once, cache it under key and return the entry"""
+    entry = encode_entry(provider, payload, RESPONSE_GZIP_MIN_BYTES)
+    if RESPONSE_CACHE_TTL > 0:
+        response_cache.set('responses', key, entry, ttl=RESPONSE_CACHE_TTL)
+    return entry
+
+
+def _cached_jsonify(key, payload):
+    """jsonify(payload), keeping the encoded body for later hits on key"""
+    return entry_response(app, _store_response(key, payload, app.json), request)
+
+
+def _cache_namespace_stats():
+    """Hit/miss stats of the shared cache and the response cache, by namespace"""
+    return {**cache.stats(), **response_cache.stats()}
+
 # Routes
 @app.route('/')
 def index():
@@ -46,19 +249,8 @@ def health():
         'dependencies': {}
     }
     
-    try:
-        response = requests.get(f'{USER_SERVICE_URL}/health', timeout=5)
-        health_status['dependencies']['user_service'] = {
-            'status': 'healthy' if response.status_code == 200 else 'unhealthy',
-            'url': USER_SERVICE_URL,
-            'deployment': 'GCP VM'
-        }
-    except Exception as e:
-        health_status['dependencies']['user_service'] = {
-            'status': 'unavailable',
-            'url': USER_SERVICE_URL,
-            'error': str(e)
-        }
+    # Probing also ejects unhealthy replicas from the balancer
+    health_status['dependencies']['user_service'] = _user_service_health(user_service.probe(timeout=5))
     
     try:
         response = requests.get(f'{COMPOSITE_SERVICE_URL}/health', timeout=2)
@@ -78,6 +270,208 @@ def health():
 
 # ==================== USER AUTHENTICATION ====================
 
+PHONE_PATTERN = re.compile(r'^\+?[1-9]\d{0,15}$')
+
+
+def _login_outcome(users, name, email, session):
+    """Match search results against the login name/email and log the user in.
+    
+    Returns (payload, status) for the response.
+    """
+    # Find user with matching email AND name
+    user = None
+    for u in users:
+        if (u.get('email', '').lower() == email and 
+            u.get('name', '').lower() == name.lower()):
+            user = u
+            break
+    
+    if user:
+        # Login successful
+        session['user_id'] = user['id']
+        session['user_email'] = user['email']
+        session['user_name'] = user['name']
+        session['user_role'] = user['role']
+        
+        logger.info(f"Login successful for user ID: {user['id']}")
+        _schedule_prefetch(user['id'])
+        
+        return {
+            'success': True,
+            'message': 'Login successful',
+            'user': {
+                'id': user['id'],
+                'name': user['name'],
+                'email': user['email'],
+                'role': user['role']
+            }
+        }, 200
+    
+    # Check if email exists but name doesn't match
+    email_exists = any(u.get('email', '').lower() == email for u in users)
+    if email_exists:
+        return {
+            'success': False,
+            'message': 'Name does not match the email. Please check your credentials.'
+        }, 401
+    return {
+        'success': False,
+        'message': 'User not found. Please check your email or sign up first.'
+    }, 404
+
+
+def _validate_signup(data):
+    """Extract and validate signup fields.
+    
+    Returns (user_data, None) on success or (None, error message).
+    """
+    # Extract all fields
+    email = data.get('email', '').strip().lower()
+    name = data.get('name', '').strip()
+    role = data.get('accountType', 'owner')  # Frontend sends 'accountType'
+    phone = data.get('phone', '').strip()
+    location = data.get('location', '').strip()
+    profile_image_url = data.get('profile_image_url', '').strip()
+    bio = data.get('bio', '').strip()
+    
+    logger.info(f"Signup attempt - Name: {name}, Email: {email}, Role: {role}")
+    
+    # Validate ALL required fields
+    if not name:
+        return None, 'Name is required'
+    if not email:
+        return None, 'Email is required'
+    if not phone:
+        return None, 'Phone is required'
+    if not location:
+        return None, 'Location is required'
+    if not profile_image_url:
+        return None, 'Profile image URL is required'
+    if not bio:
+        return None, 'Bio is required'
+    
+    # Simple email validation
+    if '@' not in email or '.' not in email:
+        return None, 'Invalid email format'
+    
+    # Validate role
+    if role not in ['owner', 'walker']:
+        return None, 'Invalid role. Must be "owner" or "walker"'
+    
+    # Validate phone format
+    if not PHONE_PATTERN.match(phone):
+        return None, 'Invalid phone format. Use digits only (e.g., 15551234567) or with + prefix (e.g., +8613812345678). No dashes or spaces allowed.'
+    
+    # Prepare user data for VM User Service with ALL fields
+    return {
+        'name': name,
+        'email': email,
+        'role': role,
+        'phone': phone,
+        'location': location,
+        'profile_image_url': profile_image_url,
+        'bio': bio
+    }, None
+
+
+def _email_taken(search_response, email):
+    """True when a user search response contains an exact email match"""
+    if search_response.status_code != 200:
+        return False
+    existing_users = search_response.json().get('data', [])
+    return any(u.get('email', '').lower() == email for u in existing_users)
+
+
+def _signup_outcome(response, user_data, session):
+    """Interpret the user service's create-user response and log the user in.
+    
+    Returns (payload, status) for the response.
+    """
+    name, email, role = user_data['name'], user_data['email'], user_data['role']
+    logger.info(f"VM Service Response Status: {response.status_code}")
+    
+    if response.status_code == 201:
+        # Success - 201 Created
+        result = response.json()
+        created_user = result.get('data', {})
+        
+        logger.info(f"User created successfully with ID: {created_user.get('id')}")
+        
+        # Auto-login after signup
+        session['user_id'] = created_user.get('id')
+        session['user_email'] = created_user.get('email', email)
+        session['user_name'] = created_user.get('name', name)
+        session['user_role'] = created_user.get('role', role)
+        
+        _stats_user_added(created_user.get('role', role))
+        _walkers_changed(created_user.get('role', role))
+        _schedule_prefetch(created_user.get('id'))
+        
+        return {
+            'success': True,
+            'message': 'Account created successfully',
+            'user': {
+                'id': created_user.get('id'),
+                'name': created_user.get('name', name),
+                'email': created_user.get('email', email),
+                'role': created_user.get('role', role)
+            }
+        }, 201  # Return 201 to match VM service
+        
+    elif response.status_code == 200:
+        # Some services might return 200 instead of 201
+        result = response.json()
+        if result.get('success'):
+            created_user = result.get('data', {})
+            logger.info(f"User created successfully (200 response)")
+            _stats_user_added(created_user.get('role', role))
+            _walkers_changed(created_user.get('role', role))
+            
+            return {
+                'success': True,
+                'message': 'Account created successfully',
+                'user': created_user
+            }, 200
+        else:
+            # 200 but not successful
+            return {
+                'success': False,
+                'message': 'Failed to create account'
+            }, 400
+            
+    elif response.status_code == 409:
+        return {
+            'success': False,
+            'message': 'Email already exists. Please use a different email.'
+        }, 409
+    elif response.status_code == 400:
+        error_data = response.json()
+        # Extract validation error details if available
+        details = error_data.get('details', [])
+        if details:
+            error_messages = []
+            for detail in details:
+                field = detail.get('field', 'unknown')
+                msg = detail.get('message', 'validation error')
+                error_messages.append(f"{field}: {msg}")
+            return {
+                'success': False,
+                'message': 'Validation errors:\n' + '\n'.join(error_messages)
+            }, 400
+        else:
+            return {
+                'success': False,
+                'message': error_data.get('message', 'Invalid input data')
+            }, 400
+    else:
+        # Any other status code is an error
+        logger.error(f"Unexpected status code: {response.status_code}")
+        logger.error(f"Response: {response.text}")
+        return {
+            'success': False,
+            'message': f'Failed to create account. Server returned status {response.status_code}'
+        }, response.status_code
+
 @app.route('/api/login', methods=['POST'])
 def login():
     """Handle user login using name and email"""
@@ -101,56 +495,16 @@ def login():
     
     try:
         # Search for user by email and verify name matches
-        response = requests.get(
-            f'{USER_SERVICE_URL}/api/users/search',
+        response = user_service.get(
+            '/api/users/search',
             params={'q': email},
             timeout=10
         )
         
         if response.status_code == 200:
             result = response.json()
-            users = result.get('data', [])
-            
-            # Find user with matching email AND name
-            user = None
-            for u in users:
-                if (u.get('email', '').lower() == email and 
-                    u.get('name', '').lower() == name.lower()):
-                    user = u
-                    break
-            
-            if user:
-                # Login successful
-                session['user_id'] = user['id']
-                session['user_email'] = user['email']
-                session['user_name'] = user['name']
-                session['user_role'] = user['role']
-                
-                logger.info(f"Login successful for user ID: {user['id']}")
-                
-                return jsonify({
-                    'success': True,
-                    'message': 'Login successful',
-                    'user': {
-                        'id': user['id'],
-                        'name': user['name'],
-                        'email': user['email'],
-                        'role': user['role']
-                    }
-                })
-            else:
-                # Check if email exists but name doesn't match
-                email_exists = any(u.get('email', '').lower() == email for u in users)
-                if email_exists:
-                    return jsonify({
-                        'success': False,
-                        'message': 'Name does not match the email. Please check your credentials.'
-                    }), 401
-                else:
-                    return jsonify({
-                        'success': False,
-                        'message': 'User not found. Please check your email or sign up first.'
-                    }), 404
+            payload, status = _login_outcome(result.get('data', []), name, email, session)
+            return jsonify(payload), status
         else:
             return jsonify({
                 'success': False,
@@ -167,198 +521,40 @@ def login():
 @app.route('/api/signup', methods=['POST'])
 def signup():
     """Handle user registration with all required fields"""
-    data = request.json
-    
-    # Extract all fields
-    email = data.get('email', '').strip().lower()
-    name = data.get('name', '').strip()
-    role = data.get('accountType', 'owner')  # Frontend sends 'accountType'
-    phone = data.get('phone', '').strip()
-    location = data.get('location', '').strip()
-    profile_image_url = data.get('profile_image_url', '').strip()
-    bio = data.get('bio', '').strip()
-    
-    logger.info(f"Signup attempt - Name: {name}, Email: {email}, Role: {role}")
-    
-    # Validate ALL required fields
-    if not name:
-        return jsonify({
-            'success': False,
-            'message': 'Name is required'
-        }), 400
-    
-    if not email:
-        return jsonify({
-            'success': False,
-            'message': 'Email is required'
-        }), 400
-    
-    if not phone:
-        return jsonify({
-            'success': False,
-            'message': 'Phone is required'
-        }), 400
-    
-    if not location:
-        return jsonify({
-            'success': False,
-            'message': 'Location is required'
-        }), 400
-    
-    if not profile_image_url:
-        return jsonify({
-            'success': False,
-            'message': 'Profile image URL is required'
-        }), 400
-    
-    if not bio:
-        return jsonify({
-            'success': False,
-            'message': 'Bio is required'
-        }), 400
-    
-    # Simple email validation
-    if '@' not in email or '.' not in email:
-        return jsonify({
-            'success': False,
-            'message': 'Invalid email format'
-        }), 400
-    
-    # Validate role
-    if role not in ['owner', 'walker']:
-        return jsonify({
-            'success': False,
-            'message': 'Invalid role. Must be "owner" or "walker"'
-        }), 400
-    
-    # Validate phone format
-    import re
-    phone_pattern = r'^\+?[1-9]\d{0,15}$'
-    if not re.match(phone_pattern, phone):
+    user_data, error = _validate_signup(request.json)
+    if error:
         return jsonify({
             'success': False,
-            'message': 'Invalid phone format. Use digits only (e.g., 15551234567) or with + prefix (e.g., +8613812345678). No dashes or spaces allowed.'
+            'message': error
         }), 400
     
     try:
         # Check if user already exists
-        search_response = requests.get(
-            f'{USER_SERVICE_URL}/api/users/search',
-            params={'q': email},
+        search_response = user_service.get(
+            '/api/users/search',
+            params={'q': user_data['email']},
             timeout=10
         )
         
-        if search_response.status_code == 200:
-            search_result = search_response.json()
-            existing_users = search_result.get('data', [])
-            
-            # Check for exact email match
-            for existing_user in existing_users:
-                if existing_user.get('email', '').lower() == email:
-                    logger.info(f"User already exists: {email}")
-                    return jsonify({
-                        'success': False,
-                        'message': 'Email already exists. Please login instead or use a different email.'
-                    }), 409
-        
-        # Prepare user data for VM User Service with ALL fields
-        user_data = {
-            'name': name,
-            'email': email,
-            'role': role,
-            'phone': phone,
-            'location': location,
-            'profile_image_url': profile_image_url,
-            'bio': bio
-        }
+        if _email_taken(search_response, user_data['email']):
+            logger.info(f"User already exists: {user_data['email']}")
+            return jsonify({
+                'success': False,
+                'message': 'Email already exists. Please login instead or use a different email.'
+            }), 409
         
         logger.info(f"Creating user with data: {json.dumps(user_data, indent=2)}")
         
         # Create user on VM service
-        response = requests.post(
-            f'{USER_SERVICE_URL}/api/users',
+        response = user_service.post(
+            '/api/users',
             json=user_data,
             headers={'Content-Type': 'application/json'},
             timeout=10
         )
         
-        logger.info(f"VM Service Response Status: {response.status_code}")
-        
-        if response.status_code == 201:
-            # Success - 201 Created
-            result = response.json()
-            created_user = result.get('data', {})
-            
-            logger.info(f"User created successfully with ID: {created_user.get('id')}")
-            
-            # Auto-login after signup
-            session['user_id'] = created_user.get('id')
-            session['user_email'] = created_user.get('email', email)
-            session['user_name'] = created_user.get('name', name)
-            session['user_role'] = created_user.get('role', role)
-            
-            return jsonify({
-                'success': True,
-                'message': 'Account created successfully',
-                'user': {
-                    'id': created_user.get('id'),
-                    'name': created_user.get('name', name),
-                    'email': created_user.get('email', email),
-                    'role': created_user.get('role', role)
-                }
-            }), 201  # Return 201 to match VM service
-            
-        elif response.status_code == 200:
-            # Some services might return 200 instead of 201
-            result = response.json()
-            if result.get('success'):
-                created_user = result.get('data', {})
-                logger.info(f"User created successfully (200 response)")
-                
-                return jsonify({
-                    'success': True,
-                    'message': 'Account created successfully',
-                    'user': created_user
-                }), 200
-            else:
-                # 200 but not successful
-                return jsonify({
-                    'success': False,
-                    'message': 'Failed to create account'
-                }), 400
-                
-        elif response.status_code == 409:
-            return jsonify({
-                'success': False,
-                'message': 'Email already exists. Please use a different email.'
-            }), 409
-        elif response.status_code == 400:
-            error_data = response.json()
-            # Extract validation error details if available
-            details = error_data.get('details', [])
-            if details:
-                error_messages = []
-                for detail in details:
-                    field = detail.get('field', 'unknown')
-                    msg = detail.get('message', 'validation error')
-                    error_messages.append(f"{field}: {msg}")
-                return jsonify({
-                    'success': False,
-                    'message': 'Validation errors:\n' + '\n'.join(error_messages)
-                }), 400
-            else:
-                return jsonify({
-                    'success': False,
-                    'message': error_data.get('message', 'Invalid input data')
-                }), 400
-        else:
-            # Any other status code is an error
-            logger.error(f"Unexpected status code: {response.status_code}")
-            logger.error(f"Response: {response.text}")
-            return jsonify({
-                'success': False,
-                'message': f'Failed to create account. Server returned status {response.status_code}'
-            }), response.status_code
+        payload, status = _signup_outcome(response, user_data, session)
+        return jsonify(payload), status
             
     except requests.exceptions.RequestException as e:
         logger.error(f"Signup error: {str(e)}")
@@ -370,6 +566,8 @@ def signup():
 @app.route('/api/logout', methods=['POST'])
 def logout():
     """Handle user logout"""
+    if 'user_id' in session:
+        _invalidate_prefetch(session['user_id'])
     session.clear()
     return jsonify({
         'success': True,
@@ -395,8 +593,109 @@ def current_user():
             'message': 'Not logged in'
         }), 401
 
+# ==================== WORKING SET PREFETCH ====================
+
+# Right after login or signup the browser asks for the profile, pets and
+# stats. Those reads are prefetched in the background into the shared cache
+# for PREFETCH_TTL seconds (0 disables it). The executor is small and bounded:
+# when it is busy, new prefetches are dropped rather than queued.
+#
+# A prefetch can still be in flight when a write invalidates its section, so
+# every section carries a generation token ('prefetch_gen' namespace). A
+# prefetch only stores its result, tagged with the token it started under,
+# if the token is unchanged, and reads ignore entries whose token is stale.
+PREFETCH_TTL = int(os.environ.get('PREFETCH_TTL', 30))
+
+prefetcher = Prefetcher(
+    max_workers=int(os.environ.get('PREFETCH_WORKERS', 3)),
+    max_pending=int(os.environ.get('PREFETCH_MAX_PENDING', 9))
+)
+
+# Working-set section -> user service path
+PREFETCH_SOURCES = {
+    'user': '/api/users/{user_id}',
+    'dogs': '/api/dogs/owner/{user_id}',
+    'stats': '/api/users/{user_id}/stats'
+}
+
+
+def _prefetch_generation(user_id, section):
+    """Current generation token of a working-set section, or None"""
+    return cache.get('prefetch_gen', f'{user_id}:{section}')
+
+
+def _new_prefetch_generation(user_id, section):
+    """Start a new generation for a section, orphaning anything tagged with the old one"""
+    generation = secrets.token_hex(8)
+    cache.set('prefetch_gen', f'{user_id}:{section}', generation, ttl=PREFETCH_TTL)
+    return generation
+
+
+def _prefetch_section(user_id, section, generation):
+    """Fetch one working-set section into the prefetch cache, unless invalidated meanwhile"""
+    response = user_service.get(PREFETCH_SOURCES[section].format(user_id=user_id), timeout=10)
+    data = response.json().get('data') if response.status_code == 200 else None
+    if data is not None and _prefetch_generation(user_id, section) == generation:
+        cache.set('prefetch', f'{user_id}:{section}', {
+            'generation': generation,
+            'data': data
+        }, ttl=PREFETCH_TTL)
+
+
+def _schedule_prefetch(user_id):
+    """Prefetch the user's working set in the background, dropping what doesn't fit"""
+    if PREFETCH_TTL <= 0 or user_id is None:
+        return
+    for section in PREFETCH_SOURCES:
+        prefetcher.submit(_prefetch_section, user_id, section, _new_prefetch_generation(user_id, section))
+
+
+def _prefetched(user_id, section):
+    """A prefetched working-set section, or None on a miss"""
+    if PREFETCH_TTL <= 0:
+        return None
+    entry = cache.get('prefetch', f'{user_id}:{section}')
+    # A prefetch that finished after an invalidation may have stored a stale entry
+    if entry is None or entry['generation'] != _prefetch_generation(user_id, section):
+        return None
+    return entry['data']
+
+
+def _invalidate_prefetch(user_id, *sections):
+    """Drop prefetched sections after a write; every section when none are named"""
+    if PREFETCH_TTL <= 0:
+        # Nothing was prefetched, and a ttl of 0 would store generations that never expire
+        return
+    for section in sections or PREFETCH_SOURCES:
+        _new_prefetch_generation(user_id, section)
+        cache.delete('prefetch', f'{user_id}:{section}')
+
+
+def _working_set_section(user_id, section, params=None):
+    """Read a working-set section, from the prefetch cache when warm.
+    
+    Returns (status code, data). A prefetched section is the full record, so
+    callers project it themselves instead of relying on params.
+    """
+    data = _prefetched(user_id, section)
+    if data is not None:
+        return 200, data
+    response = user_service.get(
+        PREFETCH_SOURCES[section].format(user_id=user_id),
+        params=params,
+        timeout=10
+    )
+    if response.status_code != 200:
+        return response.status_code, None
+    return 200, response.json().get('data')
+
 # ==================== USER PROFILE ====================
 
+def _profile_update_data(data):
+    """Only send fields that are being updated"""
+    return {field: data[field] for field in ('name', 'phone', 'location', 'bio') if field in data}
+
+
 @app.route('/api/profile', methods=['GET', 'PUT', 'DELETE'])
 def profile():
     """Get, update, or delete user profile using VM Service"""
@@ -407,52 +706,47 @@ def profile():
         }), 401
     
     if request.method == 'GET':
+        # ?fields=user.name,dogs.name,stats picks sections and fields within them;
+        # dogs and stats are only fetched when asked for
         try:
-            # Get user from VM service
-            response = requests.get(
-                f'{USER_SERVICE_URL}/api/users/{session["user_id"]}',
-                timeout=10
-            )
+            sections = _requested_profile_fields()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        try:
+            # Get user from VM service (or the post-login prefetch)
+            user_id = session['user_id']
+            user_fields = sections.get('user', set()) if sections else None
+            status, user = _working_set_section(user_id, 'user', _upstream_params(user_fields))
             
-            if response.status_code == 200:
-                result = response.json()
-                user_data = result.get('data', {})
+            if status == 200:
+                profile_data = {}
+                if sections is None or 'user' in sections:
+                    profile_data['user'] = _project(user or {}, user_fields)
                 
                 # Get user's dogs
-                dogs_response = requests.get(
-                    f'{USER_SERVICE_URL}/api/dogs/owner/{session["user_id"]}',
-                    timeout=10
-                )
-                
-                dogs = []
-                if dogs_response.status_code == 200:
-                    dogs_result = dogs_response.json()
-                    dogs = dogs_result.get('data', [])
+                if sections is None or 'dogs' in sections:
+                    dog_fields = sections.get('dogs') if sections else None
+                    _, dogs = _working_set_section(user_id, 'dogs', _upstream_params(dog_fields))
+                    profile_data['dogs'] = [_project(dog, dog_fields) for dog in dogs or []]
                 
                 # Get user stats
-                stats_response = requests.get(
-                    f'{USER_SERVICE_URL}/api/users/{session["user_id"]}/stats',
-                    timeout=10
-                )
-                
-                stats = {}
-                if stats_response.status_code == 200:
-                    stats_result = stats_response.json()
-                    stats = stats_result.get('data', {})
+                if sections is None or 'stats' in sections:
+                    _, stats = _working_set_section(user_id, 'stats')
+                    profile_data['stats'] = _project(stats or {}, sections.get('stats') if sections else None)
                 
                 return jsonify({
                     'success': True,
-                    'data': {
-                        'user': user_data,
-                        'dogs': dogs,
-                        'stats': stats
-                    }
+                    'data': profile_data
                 })
             else:
                 return jsonify({
                     'success': False,
                     'message': 'Failed to get profile'
-                }), response.status_code
+                }), status
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Get profile error: {str(e)}")
@@ -462,21 +756,10 @@ def profile():
             }), 503
     
     elif request.method == 'PUT':
-        data = request.json
+        update_data = _profile_update_data(request.json)
         try:
-            # Only send fields that are being updated
-            update_data = {}
-            if 'name' in data:
-                update_data['name'] = data['name']
-            if 'phone' in data:
-                update_data['phone'] = data['phone']
-            if 'location' in data:
-                update_data['location'] = data['location']
-            if 'bio' in data:
-                update_data['bio'] = data['bio']
-            
-            response = requests.put(
-                f'{USER_SERVICE_URL}/api/users/{session["user_id"]}',
+            response = user_service.put(
+                f'/api/users/{session["user_id"]}',
                 json=update_data,
                 headers={'Content-Type': 'application/json'},
                 timeout=10
@@ -489,6 +772,8 @@ def profile():
                 # Update session
                 if 'name' in updated_user:
                     session['user_name'] = updated_user['name']
+                _invalidate_prefetch(session['user_id'], 'user')
+                _walkers_changed(session.get('user_role'))
                 
                 return jsonify({
                     'success': True,
@@ -511,12 +796,15 @@ def profile():
     else:  # DELETE
         try:
             # Soft delete user
-            response = requests.delete(
-                f'{USER_SERVICE_URL}/api/users/{session["user_id"]}',
+            response = user_service.delete(
+                f'/api/users/{session["user_id"]}',
                 timeout=10
             )
             
             if response.status_code in [200, 204]:
+                _stats_user_removed(session.get('user_role'))
+                _walkers_changed(session.get('user_role'))
+                _invalidate_prefetch(session['user_id'])
                 session.clear()
                 return jsonify({
                     'success': True,
@@ -537,6 +825,39 @@ def profile():
 
 # ==================== PET MANAGEMENT ====================
 
+def _new_dog_data(data, owner_id):
+    """Prepare dog data for the user service from the add-pet form"""
+    dog_data = {
+        'owner_id': owner_id,
+        'name': data.get('name'),
+        'breed': data.get('breed', 'Mixed'),
+        'age': int(data.get('ageYears', 0)) if data.get('ageYears') else 0,
+        'size': data.get('size', 'medium'),
+        'temperament': data.get('temperament', 'Friendly'),
+        'energy_level': data.get('energy_level', 'medium'),
+        'is_friendly_with_other_dogs': True,
+        'is_friendly_with_children': True
+    }
+    
+    if data.get('special_needs'):
+        dog_data['special_needs'] = data.get('special_needs')
+    return dog_data
+
+
+def _format_pet(dog):
+    """Shape a user service dog record for the frontend"""
+    return {
+        'id': dog.get('id'),
+        'name': dog.get('name'),
+        'type': 'dog',
+        'breed': dog.get('breed', 'Mixed breed'),
+        'age': dog.get('age', 0),
+        'size': dog.get('size', 'medium'),
+        'temperament': dog.get('temperament', ''),
+        'energy_level': dog.get('energy_level', 'medium')
+    }
+
+
 @app.route('/api/pets', methods=['GET', 'POST'])
 def pets():
     """Handle pet management using VM User Service"""
@@ -551,25 +872,11 @@ def pets():
         logger.info(f"Adding new pet: {data.get('name')}")
         
         try:
-            # Prepare dog data
-            dog_data = {
-                'owner_id': session['user_id'],
-                'name': data.get('name'),
-                'breed': data.get('breed', 'Mixed'),
-                'age': int(data.get('ageYears', 0)) if data.get('ageYears') else 0,
-                'size': data.get('size', 'medium'),
-                'temperament': data.get('temperament', 'Friendly'),
-                'energy_level': data.get('energy_level', 'medium'),
-                'is_friendly_with_other_dogs': True,
-                'is_friendly_with_children': True
-            }
-            
-            if data.get('special_needs'):
-                dog_data['special_needs'] = data.get('special_needs')
+            dog_data = _new_dog_data(data, session['user_id'])
             
             # Create dog on VM service
-            response = requests.post(
-                f'{USER_SERVICE_URL}/api/dogs',
+            response = user_service.post(
+                '/api/dogs',
                 json=dog_data,
                 headers={'Content-Type': 'application/json'},
                 timeout=10
@@ -577,6 +884,9 @@ def pets():
             
             if response.status_code in [200, 201]:
                 result = response.json()
+                created_dog = result.get('data') or dog_data
+                _stats_dog_changed(None, created_dog)
+                _invalidate_prefetch(session['user_id'], 'dogs', 'stats')
                 return jsonify({
                     'success': True,
                     'message': 'Pet added successfully',
@@ -597,30 +907,22 @@ def pets():
             }), 503
     
     else:  # GET
+        try:
+            fields = _requested_fields(PET_FIELDS)
+        except ValueError as e:
+            return jsonify({'pets': [], 'message': str(e)}), 400
+        
         if 'user_id' not in session:
             return jsonify({'pets': []})
         
         try:
-            # Get user's dogs from VM service
-            response = requests.get(
-                f'{USER_SERVICE_URL}/api/dogs/owner/{session["user_id"]}',
-                timeout=10
+            # Get user's dogs from VM service (or the post-login prefetch)
+            status, dogs = _working_set_section(
+                session['user_id'], 'dogs', _upstream_params(fields, PET_FIELDS)
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                dogs = result.get('data', [])
-                
-                pets_formatted = [{
-                    'id': dog.get('id'),
-                    'name': dog.get('name'),
-                    'type': 'dog',
-                    'breed': dog.get('breed', 'Mixed breed'),
-                    'age': dog.get('age', 0),
-                    'size': dog.get('size', 'medium'),
-                    'temperament': dog.get('temperament', ''),
-                    'energy_level': dog.get('energy_level', 'medium')
-                } for dog in dogs]
+            if status == 200:
+                pets_formatted = [_project(_format_pet(dog), fields) for dog in dogs or []]
                 
                 return jsonify({'pets': pets_formatted})
             else:
@@ -639,11 +941,14 @@ def manage_pet(pet_id):
             'message': 'Please login first'
         }), 401
     
+    # Snapshot the dog before changing it so the stats view can be adjusted
+    old_dog = _get_dog(pet_id) if cache.get('stats', 'view') is not None else None
+    
     if request.method == 'PUT':
         data = request.json
         try:
-            response = requests.put(
-                f'{USER_SERVICE_URL}/api/dogs/{pet_id}',
+            response = user_service.put(
+                f'/api/dogs/{pet_id}',
                 json=data,
                 headers={'Content-Type': 'application/json'},
                 timeout=10
@@ -651,6 +956,11 @@ def manage_pet(pet_id):
             
             if response.status_code == 200:
                 result = response.json()
+                if old_dog is not None:
+                    _stats_dog_changed(old_dog, {**old_dog, **result.get('data', data)})
+                else:
+                    _stats_reconcile_event.set()
+                _invalidate_prefetch(session['user_id'], 'dogs', 'stats')
                 return jsonify({
                     'success': True,
                     'message': 'Pet updated successfully',
@@ -671,12 +981,17 @@ def manage_pet(pet_id):
     
     else:  # DELETE
         try:
-            response = requests.delete(
-                f'{USER_SERVICE_URL}/api/dogs/{pet_id}',
+            response = user_service.delete(
+                f'/api/dogs/{pet_id}',
                 timeout=10
             )
             
             if response.status_code in [200, 204]:
+                if old_dog is not None:
+                    _stats_dog_changed(old_dog, None)
+                else:
+                    _stats_reconcile_event.set()
+                _invalidate_prefetch(session['user_id'], 'dogs', 'stats')
                 return jsonify({
                     'success': True,
                     'message': 'Pet deleted successfully'
@@ -696,71 +1011,243 @@ def manage_pet(pet_id):
 
 # ==================== STATISTICS ====================
 
+# Materialized stats view, stored in the shared cache so every worker sees the
+# same numbers. Seeded once from the user service, then kept current by the
+# write paths below and periodically reconciled to fix drift.
+STATS_RECONCILE_INTERVAL = int(os.environ.get('STATS_RECONCILE_INTERVAL', 300))
+STATS_RETRY_INTERVAL = int(os.environ.get('STATS_RETRY_INTERVAL', 30))
+
+_stats_lock = threading.Lock()
+_stats_reconcile_event = threading.Event()
+_stats_reconciler = None
+
+
+# Upstream calls behind the stats view, in the order _stats_from_responses expects
+STATS_SOURCES = (
+    ('/api/users', {'limit': 1}),
+    ('/api/dogs/stats/breeds', None),
+    ('/api/dogs/stats/sizes', None),
+    ('/api/users/owners', {'limit': 1}),
+    ('/api/users/walkers', {'limit': 1})
+)
+
+
+def _stats_from_responses(users_response, breed_stats_response, size_stats_response,
+                          owners_response, walkers_response):
+    """Build the statistics snapshot from the STATS_SOURCES responses.
+    
+    Returns (snapshot, complete). A source that failed leaves its fields at 0
+    or [], and complete is False: such a snapshot can be shown but must never
+    be stored as the view, where it would zero out counts.
+    """
+    responses = (users_response, breed_stats_response, size_stats_response,
+                 owners_response, walkers_response)
+    
+    def body(response):
+        return response.json() if response.status_code == 200 else {}
+    
+    breeds = body(breed_stats_response).get('data', [])
+    return {
+        'totalUsers': body(users_response).get('total', 0),
+        'totalDogs': sum(b.get('count', 0) for b in breeds),
+        'owners': body(owners_response).get('total', 0),
+        'walkers': body(walkers_response).get('total', 0),
+        'breeds': breeds,
+        'sizes': body(size_stats_response).get('data', [])
+    }, all(response.status_code == 200 for response in responses)
+
+
+def _fetch_stats():
+    """Recompute the full statistics snapshot from the user service: (snapshot, complete)"""
+    responses = [user_service.get(path, params=params, timeout=10) for path, params in STATS_SOURCES]
+    return _stats_from_responses(*responses)
+
+
+def _publish_stats_version(view):
+    """Point readers of the stats response cache at view's version"""
+    cache.set('stats', 'version', view['version'], ttl=2 * STATS_RECONCILE_INTERVAL)
+
+
+def _reconcile_stats(snapshot=None):
+    """Replace the materialized view with a fresh upstream snapshot.
+    
+    snapshot is a (stats, complete) pair as from _stats_from_responses, fetched
+    when not given. The view is {'version': token, 'stats': stats}; every change
+    gets a new token. A partial snapshot is returned with version None and not stored.
+    """
+    stats, complete = snapshot or _fetch_stats()
+    if not complete:
+        return {'version': None, 'stats': stats}
+    view = {'version': secrets.token_hex(8), 'stats': stats}
+    # Expire a view nobody has reconciled in a while, e.g. left over from a restart
+    cache.set('stats', 'view', view, ttl=2 * STATS_RECONCILE_INTERVAL)
+    _publish_stats_version(view)
+    return view
+
+
+def _stats_reconcile_loop():
+    """Background thread: reconcile on a timer, or sooner when a write asks.
+    
+    A failed or partial reconcile keeps the previous view and retries after
+    STATS_RETRY_INTERVAL.
+    """
+    wait = STATS_RECONCILE_INTERVAL
+    while True:
+        _stats_reconcile_event.wait(wait)
+        _stats_reconcile_event.clear()
+        try:
+            complete = _reconcile_stats()['version'] is not None
+            if not complete:
+                logger.warning("Stats reconciliation got a partial snapshot, keeping the previous view")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Stats reconciliation failed, keeping the previous view: {str(e)}")
+            complete = False
+        except Exception as e:
+            # Anything else (e.g. a locked SQLite cache) must not kill the thread:
+            # it is never restarted, so drift correction would silently stop
+            logger.exception(f"Stats reconciliation failed, keeping the previous view: {str(e)}")
+            complete = False
+        wait = STATS_RECONCILE_INTERVAL if complete else min(STATS_RETRY_INTERVAL, STATS_RECONCILE_INTERVAL)
+
+
+def _current_stats_view():
+    """The materialized view, or None. An unversioned view from an older deploy counts as missing."""
+    view = cache.get('stats', 'view')
+    return view if view is not None and 'version' in view else None
+
+
+def _ensure_stats_view():
+    """Return the view, seeding it on first use, and start this process's reconciler"""
+    view = _current_stats_view()
+    if view is None:
+        view = _reconcile_stats()
+    _start_stats_reconciler()
+    return view
+
+
+def _stats_response_key(version):
+    """Response cache key for the stats response built from one view version"""
+    return f'{STATS_RESPONSE_KEY}#{version}'
+
+
+def _cached_stats_response():
+    """The cached stats response for the current view version, or None.
+    
+    Entries are keyed by the version they were built from, so one encoded
+    from a view that has since changed is never served.
+    """
+    version = cache.get('stats', 'version')
+    return _cached_response(_stats_response_key(version)) if version is not None else None
+
+
+def _start_stats_reconciler():
+    global _stats_reconciler
+    with _stats_lock:
+        if _stats_reconciler is None:
+            _stats_reconciler = threading.Thread(
+                target=_stats_reconcile_loop, name='stats-reconciler', daemon=True
+            )
+            _stats_reconciler.start()
+
+
+def _update_stats_view(apply):
+    """Apply an in-place change to a copy of the view's stats and store it atomically"""
+    def update(view):
+        if 'version' not in view:
+            return None
+        stats = copy.deepcopy(view['stats'])
+        apply(stats)
+        return {'version': secrets.token_hex(8), 'stats': stats}
+    view = cache.update('stats', 'view', update)
+    if view is not None:
+        _publish_stats_version(view)
+
+
+def _bump_histogram(buckets, key, value, delta):
+    """Adjust the count of one breed/size bucket, adding or dropping it as needed"""
+    for bucket in buckets:
+        if bucket.get(key) == value:
+            bucket['count'] = bucket.get('count', 0) + delta
+            if bucket['count'] <= 0:
+                buckets.remove(bucket)
+            return
+    if delta > 0:
+        buckets.append({key: value, 'count': delta})
+
+
+def _stats_user_added(role):
+    """Record a new user in the stats view"""
+    def apply(view):
+        view['totalUsers'] += 1
+        if role == 'owner':
+            view['owners'] += 1
+        elif role == 'walker':
+            view['walkers'] += 1
+    _update_stats_view(apply)
+
+
+def _stats_user_removed(role):
+    """Record a deactivated user in the stats view"""
+    def apply(view):
+        view['totalUsers'] = max(view['totalUsers'] - 1, 0)
+        if role == 'owner':
+            view['owners'] = max(view['owners'] - 1, 0)
+        elif role == 'walker':
+            view['walkers'] = max(view['walkers'] - 1, 0)
+    _update_stats_view(apply)
+    # The user's dogs are removed upstream too; let the reconciler pick that up
+    _stats_reconcile_event.set()
+
+
+def _stats_dog_changed(old_dog, new_dog):
+    """Move a dog between breed/size buckets. None means added or deleted."""
+    def apply(view):
+        if old_dog is None and new_dog is not None:
+            view['totalDogs'] += 1
+        elif old_dog is not None and new_dog is None:
+            view['totalDogs'] = max(view['totalDogs'] - 1, 0)
+        for key, buckets in (('breed', view['breeds']), ('size', view['sizes'])):
+            old_value = old_dog.get(key) if old_dog else None
+            new_value = new_dog.get(key) if new_dog else None
+            if old_value == new_value:
+                continue
+            if old_value is not None:
+                _bump_histogram(buckets, key, old_value, -1)
+            if new_value is not None:
+                _bump_histogram(buckets, key, new_value, 1)
+    _update_stats_view(apply)
+
+
+def _get_dog(pet_id):
+    """Fetch a single dog record, or None if it cannot be read"""
+    try:
+        response = user_service.get(f'/api/dogs/{pet_id}', timeout=10)
+        if response.status_code == 200:
+            return response.json().get('data')
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Get dog {pet_id} error: {str(e)}")
+    return None
+
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
-    """Get statistics from VM User Service"""
+    """Get statistics from the materialized stats view"""
+    entry = _cached_stats_response()
+    if entry is not None:
+        _start_stats_reconciler()
+        return entry_response(app, entry, request)
+    
     try:
-        stats = {
-            'totalUsers': 0,
-            'totalDogs': 0,
-            'owners': 0,
-            'walkers': 0,
-            'breeds': [],
-            'sizes': []
+        view = _ensure_stats_view()
+        payload = {
+            'success': True,
+            'stats': view['stats']
         }
+        if view['version'] is None:
+            # Partial snapshot from a failed seed: serve it, but don't cache it
+            return jsonify(payload)
         
-        # Get user count
-        users_response = requests.get(
-            f'{USER_SERVICE_URL}/api/users',
-            params={'limit': 1},
-            timeout=10
-        )
-        
-        if users_response.status_code == 200:
-            users_data = users_response.json()
-            stats['totalUsers'] = users_data.get('total', 0)
-        
-        # Get dog statistics
-        breed_stats_response = requests.get(
-            f'{USER_SERVICE_URL}/api/dogs/stats/breeds',
-            timeout=10
-        )
-        
-        if breed_stats_response.status_code == 200:
-            breed_data = breed_stats_response.json()
-            stats['breeds'] = breed_data.get('data', [])
-            stats['totalDogs'] = sum(b.get('count', 0) for b in stats['breeds'])
-        
-        size_stats_response = requests.get(
-            f'{USER_SERVICE_URL}/api/dogs/stats/sizes',
-            timeout=10
-        )
-        
-        if size_stats_response.status_code == 200:
-            size_data = size_stats_response.json()
-            stats['sizes'] = size_data.get('data', [])
-        
-        # Get owner and walker counts
-        owners_response = requests.get(
-            f'{USER_SERVICE_URL}/api/users/owners',
-            params={'limit': 1},
-            timeout=10
-        )
-        if owners_response.status_code == 200:
-            stats['owners'] = owners_response.json().get('total', 0)
-        
-        walkers_response = requests.get(
-            f'{USER_SERVICE_URL}/api/users/walkers',
-            params={'limit': 1},
-            timeout=10
-        )
-        if walkers_response.status_code == 200:
-            stats['walkers'] = walkers_response.json().get('total', 0)
-        
-        return jsonify({
-            'success': True,
-            'stats': stats
-        })
+        return _cached_jsonify(_stats_response_key(view['version']), payload)
         
     except requests.exceptions.RequestException as e:
         logger.error(f"Get stats error: {str(e)}")
@@ -769,28 +1256,394 @@ def get_stats():
             'message': f'Service error: {str(e)}'
         }), 503
 
+# ==================== WALKER RANKING ====================
+
+# Walkers are ranked over a cached candidate set held as columnar NumPy arrays
+WALKER_CANDIDATE_LIMIT = int(os.environ.get('WALKER_CANDIDATE_LIMIT', 50000))
+WALKER_CANDIDATE_TTL = int(os.environ.get('WALKER_CANDIDATE_TTL', 60))
+WALKER_CANDIDATE_PARAMS = {'role': 'walker', 'limit': WALKER_CANDIDATE_LIMIT}
+WALKER_DEFAULT_PRICE = 25
+WALKER_SORT_OPTIONS = ('best', 'rating', 'reviews', 'price')
+
+# Proximity search: grid cell size, radius used for ?location=, and the
+# distance over which the 'best' score's location component decays
+WALKER_GRID_CELL_DEG = float(os.environ.get('WALKER_GRID_CELL_DEG', 0.05))
+WALKER_LOCATION_RADIUS_KM = float(os.environ.get('WALKER_LOCATION_RADIUS_KM', 10))
+WALKER_DISTANCE_SCALE_KM = 5.0
+
+# Weights for the 'best' composite score
+RANK_WEIGHT_RATING = 0.6
+RANK_WEIGHT_LOCATION = 0.25
+RANK_WEIGHT_PRICE = 0.15
+
+# The raw walker list is shared through the cache; each process keeps its own
+# columnar copy, rebuilt only when the shared list is replaced.
+#
+# ('walkers', 'version') is a token that a walker's signup, profile update or
+# deactivation replaces. Candidate lists, columnar copies and cached walker
+# responses all carry the version they were built under, so none outlive a
+# walker write.
+_walker_lock = threading.Lock()
+_walker_candidates = None
+
+
+def _walker_price(walker):
+    """A walker's price, or WALKER_DEFAULT_PRICE when the record has none (0 is a price)"""
+    price = walker.get('price')
+    return WALKER_DEFAULT_PRICE if price is None else price
+
+
+def _format_walker(walker):
+    """Shape a user service walker record for the frontend"""
+    return {
+        'id': walker.get('id'),
+        'name': walker.get('name'),
+        'rating': walker.get('rating', 0.0),
+        'reviews': walker.get('total_reviews', 0),
+        'location': walker.get('location', 'Unknown'),
+        'bio': walker.get('bio', ''),
+        'price': _walker_price(walker),
+        'availability': 'Available'
+    }
+
+
+def _walker_coordinates(walker):
+    """Walker position from explicit coordinates or the gazetteer, else NaNs"""
+    if walker.get('latitude') is not None and walker.get('longitude') is not None:
+        return float(walker['latitude']), float(walker['longitude'])
+    return resolve_location(walker.get('location') or '') or (np.nan, np.nan)
+
+
+def _build_walker_columns(walkers):
+    """Convert walker records into columnar arrays and a spatial index"""
+    rating = np.array([float(w.get('rating') or 0.0) for w in walkers], dtype=np.float64)
+    reviews = np.array([int(w.get('total_reviews') or 0) for w in walkers], dtype=np.float64)
+    price = np.array([float(_walker_price(w)) for w in walkers], dtype=np.float64)
+    coords = np.array([_walker_coordinates(w) for w in walkers], dtype=np.float64).reshape(-1, 2)
+    
+    return {
+        'records': walkers,
+        'rating': rating,
+        'reviews': reviews,
+        'price': price,
+        'location': np.array([(w.get('location') or '').lower() for w in walkers], dtype=np.str_),
+        'geo': GridIndex(coords[:, 0], coords[:, 1], cell_deg=WALKER_GRID_CELL_DEG),
+        # Walkers neither coordinates nor the gazetteer could place
+        'unplaced': np.isnan(coords[:, 0]),
+        # Priors for Bayesian smoothing and price normalization, over all walkers
+        'prior_weight': max(float(reviews.mean()), 1.0) if reviews.size else 1.0,
+        'prior_mean': float(rating.mean()) if rating.size else 0.0,
+        'price_min': float(price.min()) if price.size else 0.0,
+        'price_max': float(price.max()) if price.size else 0.0
+    }
+
+
+def _new_walkers_version():
+    """Start a new walker data version, orphaning everything built under the old one"""
+    version = secrets.token_hex(8)
+    cache.set('walkers', 'version', version)
+    return version
+
+
+def _walkers_version():
+    """The current walker data version, starting one if there is none"""
+    return cache.get('walkers', 'version') or _new_walkers_version()
+
+
+def _walkers_changed(role):
+    """Invalidate walker candidates and responses after a user with role changed"""
+    if role == 'walker':
+        _new_walkers_version()
+        cache.delete('walkers', 'candidates')
+
+
+def _walkers_response_key(args):
+    """Response cache key for a walker listing under the current walker version"""
+    return f"{_response_cache_key('/api/walkers', args)}#{_walkers_version()}"
+
+
+def _cached_walker_columns(version):
+    """This process's columnar candidate set, or None when expired or from another version"""
+    with _walker_lock:
+        if (_walker_candidates is not None and _walker_candidates['version'] == version and
+                time.time() < _walker_candidates['expires_at']):
+            return _walker_candidates
+    return None
+
+
+def _shared_walker_candidates(version):
+    """The shared candidate entry for version, or None"""
+    entry = cache.get('walkers', 'candidates')
+    return entry if entry is not None and entry.get('version') == version else None
+
+
+def _store_walker_candidates(response, version):
+    """Share a fresh upstream walker list through the cache and return its entry"""
+    response.raise_for_status()
+    entry = {
+        'version': version,
+        'expires_at': time.time() + WALKER_CANDIDATE_TTL,
+        'data': response.json().get('data', [])
+    }
+    cache.set('walkers', 'candidates', entry, ttl=WALKER_CANDIDATE_TTL)
+    return entry
+
+
+def _walker_columns_from_entry(entry):
+    """Build and keep this process's columns for a shared candidate entry"""
+    global _walker_candidates
+    columns = _build_walker_columns(entry['data'])
+    columns['version'] = entry['version']
+    columns['expires_at'] = entry['expires_at']
+    with _walker_lock:
+        _walker_candidates = columns
+    return columns
+
+
+def _load_walker_candidates():
+    """Return the columnar walker candidate set, refreshing it when stale"""
+    version = _walkers_version()
+    columns = _cached_walker_columns(version)
+    if columns is not None:
+        return columns
+    
+    entry = _shared_walker_candidates(version)
+    if entry is None:
+        entry = _store_walker_candidates(user_service.get(
+            '/api/users',
+            params=WALKER_CANDIDATE_PARAMS,
+            timeout=10
+        ), version)
+    return _walker_columns_from_entry(entry)
+
+
+def _score_walkers(columns, sort, location=None, ids=None, distances=None):
+    """Score candidates in one vectorized pass. Higher is better.
+    
+    ids restricts scoring to a subset of rows; distances (aligned with ids)
+    replaces the location string match with a distance decay; a NaN distance
+    (an unplaced walker that matched by text) counts as a full location match.
+    """
+    rating = columns['rating'] if ids is None else columns['rating'][ids]
+    reviews = columns['reviews'] if ids is None else columns['reviews'][ids]
+    price = columns['price'] if ids is None else columns['price'][ids]
+    
+    if sort == 'reviews':
+        return reviews
+    if sort == 'price':
+        return -price
+    
+    # Bayesian-smoothed rating: shrink walkers with few reviews toward the mean
+    prior_weight = columns['prior_weight']
+    smoothed = (reviews * rating + prior_weight * columns['prior_mean']) / (reviews + prior_weight)
+    if sort == 'rating':
+        return smoothed
+    
+    # 'best': blend smoothed rating, location match and price, each in [0, 1]
+    rating_score = smoothed / 5.0
+    if distances is not None:
+        location_score = np.nan_to_num(np.exp(-distances / WALKER_DISTANCE_SCALE_KM), nan=1.0)
+    elif location:
+        names = columns['location'] if ids is None else columns['location'][ids]
+        location_score = (np.char.find(names, location.lower()) >= 0).astype(np.float64)
+    else:
+        location_score = np.zeros_like(rating)
+    price_range = columns['price_max'] - columns['price_min']
+    if price_range > 0:
+        price_score = (columns['price_max'] - price) / price_range
+    else:
+        price_score = np.ones_like(price)
+    
+    return (RANK_WEIGHT_RATING * rating_score +
+            RANK_WEIGHT_LOCATION * location_score +
+            RANK_WEIGHT_PRICE * price_score)
+
+
+def _top_k(scores, k, mask=None):
+    """Indices of the k highest scores, best first, without a full sort"""
+    if mask is not None:
+        candidates = np.flatnonzero(mask)
+        scores = scores[candidates]
+    else:
+        candidates = np.arange(scores.size)
+    if k < scores.size:
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(scores.size)
+    order = part[np.argsort(-scores[part], kind='stable')]
+    return candidates[order]
+
+
+def _rank_walkers(columns, sort, limit, location=None, min_rating=None, origin=None, radius_km=None):
+    """Rank the columnar candidate set.
+    
+    Without an origin, location and min_rating filter the candidates. With
+    one, candidates come from the spatial index: everything within radius_km,
+    or the limit nearest when no radius is given. A location then also adds
+    the walkers the index cannot place whose location text matches it, with
+    a NaN distance, after the placed ones. Results are ordered by sort, or
+    by distance when sort is None.
+    
+    Returns (top walkers, their distances or None, number of matches).
+    """
+    records = columns['records']
+    
+    mask = None
+    if min_rating is not None:
+        mask = columns['rating'] >= min_rating
+    
+    if origin is None:
+        # Without an origin, ?location= filters like the upstream listing does
+        if location:
+            matches = np.char.find(columns['location'], location.lower()) >= 0
+            mask = matches if mask is None else mask & matches
+        scores = _score_walkers(columns, sort, location)
+        matched = int(mask.sum()) if mask is not None else scores.size
+        return [records[i] for i in _top_k(scores, limit, mask)], None, matched
+    
+    lat, lon = origin
+    if radius_km is not None:
+        ids, distances = columns['geo'].within(lat, lon, radius_km, mask)
+    else:
+        ids, distances = columns['geo'].nearest(lat, lon, limit, mask)
+    if location:
+        # e.g. "Brooklyn Heights, NY" has no coordinates but still matches ?location=Brooklyn
+        unplaced = columns['unplaced'] & (np.char.find(columns['location'], location.lower()) >= 0)
+        if mask is not None:
+            unplaced &= mask
+        extra = np.flatnonzero(unplaced)
+        ids = np.concatenate([ids, extra])
+        distances = np.concatenate([distances, np.full(extra.size, np.nan)])
+    matched = ids.size
+    
+    if sort:
+        order = _top_k(_score_walkers(columns, sort, ids=ids, distances=distances), limit)
+    else:
+        order = np.arange(min(limit, ids.size))
+    ids, distances = ids[order], distances[order]
+    return [records[i] for i in ids], distances.tolist(), matched
+
 # ==================== WALKER SEARCH ====================
 
+def _walker_origin(args):
+    """Resolve ?near=, ?lat=&lon= or ?location= to a search origin.
+    
+    Returns (origin, default radius, error message).
+    """
+    near = args.get('near')
+    location = args.get('location')
+    # ?near=, ?lat=&lon= or a ?location= the gazetteer knows go through the
+    # spatial index, so "Brooklyn" and "Brooklyn, NY" find the same walkers;
+    # for ?location=, walkers the index can't place still match by text
+    if near:
+        origin = resolve_location(near)
+        if origin is None:
+            return None, None, f'Unknown location: {near}'
+        return origin, None, None
+    if args.get('lat') and args.get('lon'):
+        origin = resolve_location(f"{args['lat']},{args['lon']}")
+        if origin is None:
+            return None, None, 'lat and lon must be valid coordinates'
+        return origin, None, None
+    if location:
+        return resolve_location(location), WALKER_LOCATION_RADIUS_KM, None
+    return None, None, None
+
+
+def _walker_params(args, fields):
+    """Query params for the plain user service walker listing"""
+    params = {
+        'role': 'walker',
+        'limit': 20
+    }
+    
+    if args.get('location'):
+        params['location'] = args['location']
+    
+    min_rating = args.get('min_rating')
+    if min_rating:
+        params['min_rating'] = min_rating
+    
+    params.update(_upstream_params(fields, WALKER_FIELDS) or {})
+    return params
+
+
+def _ranking_options(args, sort, default_radius=None):
+    """Validate the ranking query: returns (options for _rank_walkers, error message)"""
+    if sort and sort not in WALKER_SORT_OPTIONS:
+        return None, f'Invalid sort. Must be one of: {", ".join(WALKER_SORT_OPTIONS)}'
+    
+    try:
+        limit = int(args.get('limit', 20))
+        min_rating = args.get('min_rating')
+        min_rating = float(min_rating) if min_rating else None
+        radius_km = args.get('radius_km')
+        radius_km = float(radius_km) if radius_km else default_radius
+    except ValueError:
+        return None, 'limit, min_rating and radius_km must be numbers'
+    
+    if limit < 1 or (radius_km is not None and radius_km <= 0):
+        return None, 'limit and radius_km must be positive'
+    
+    return {
+        'sort': sort,
+        'limit': limit,
+        'location': args.get('location'),
+        'min_rating': min_rating,
+        'radius_km': radius_km
+    }, None
+
+
+def _ranked_walkers_payload(ranked, sort, origin, fields):
+    """Response body for a ranked or proximity walker search"""
+    walkers, distances, matched = ranked
+    walkers_formatted = [_format_walker(walker) for walker in walkers]
+    if distances is not None:
+        for walker, distance in zip(walkers_formatted, distances):
+            walker['distance_km'] = None if np.isnan(distance) else round(distance, 2)
+    
+    return {
+        'success': True,
+        'walkers': [_project(walker, fields) for walker in walkers_formatted],
+        'total': matched,
+        'sort': sort or ('distance' if origin else None)
+    }
+
+
 @app.route('/api/walkers', methods=['GET'])
 def get_walkers():
     """Get available walkers from VM User Service"""
+    sort = request.args.get('sort')
+    
     try:
-        params = {
-            'role': 'walker',
-            'limit': 20
-        }
-        
-        location = request.args.get('location')
-        if location:
-            params['location'] = location
-        
-        min_rating = request.args.get('min_rating')
-        if min_rating:
-            params['min_rating'] = min_rating
-        
-        response = requests.get(
-            f'{USER_SERVICE_URL}/api/users',
-            params=params,
+        fields = _requested_fields(WALKER_FIELDS)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'message': str(e)
+        }), 400
+    
+    origin, default_radius, error = _walker_origin(request.args)
+    if error:
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'message': error
+        }), 400
+    
+    cache_key = _walkers_response_key(request.args)
+    entry = _cached_response(cache_key)
+    if entry is not None:
+        return entry_response(app, entry, request)
+    
+    if sort or origin:
+        return _get_ranked_walkers(sort, origin, default_radius, fields, cache_key)
+    
+    try:
+        response = user_service.get(
+            '/api/users',
+            params=_walker_params(request.args, fields),
             timeout=10
         )
         
@@ -798,18 +1651,9 @@ def get_walkers():
             result = response.json()
             walkers = result.get('data', [])
             
-            walkers_formatted = [{
-                'id': walker.get('id'),
-                'name': walker.get('name'),
-                'rating': walker.get('rating', 0.0),
-                'reviews': walker.get('total_reviews', 0),
-                'location': walker.get('location', 'Unknown'),
-                'bio': walker.get('bio', ''),
-                'price': 25,
-                'availability': 'Available'
-            } for walker in walkers]
+            walkers_formatted = [_project(_format_walker(walker), fields) for walker in walkers]
             
-            return jsonify({
+            return _cached_jsonify(cache_key, {
                 'success': True,
                 'walkers': walkers_formatted,
                 'total': result.get('total', len(walkers))
@@ -828,6 +1672,32 @@ def get_walkers():
             'error': str(e)
         })
 
+
+def _get_ranked_walkers(sort, origin=None, default_radius=None, fields=None, cache_key=None):
+    """Handle /api/walkers?sort=... and proximity searches using the ranking engine"""
+    options, error = _ranking_options(request.args, sort, default_radius)
+    if error:
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'message': error
+        }), 400
+    
+    try:
+        ranked = _rank_walkers(_load_walker_candidates(), origin=origin, **options)
+        payload = _ranked_walkers_payload(ranked, sort, origin, fields)
+        if cache_key is None:
+            return jsonify(payload)
+        return _cached_jsonify(cache_key, payload)
+        
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Rank walkers error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'error': str(e)
+        })
+
 # ==================== VM SERVICE INFO ====================
 
 @app.route('/api/service-info', methods=['GET'])
@@ -836,6 +1706,8 @@ def service_info():
     return jsonify({
         'user_service': {
             'url': USER_SERVICE_URL,
+            'replicas': user_service.snapshot(),
+            'balance_policy': user_service.policy,
             'swagger_ui': f'{USER_SERVICE_URL}/api-docs',
             'swagger_json': f'{USER_SERVICE_URL}/api-docs/swagger.json',
             'deployment': 'GCP Compute Engine VM',
@@ -846,7 +1718,16 @@ def service_info():
             'url': COMPOSITE_SERVICE_URL,
             'deployment': 'Local (for development)',
             'port': 3002
-        }
+        },
+        'cache': {
+            'backend': cache.name,
+            'worker_pid': os.getpid(),
+            # 'process' counts only the worker that answered; 'host' counts them all
+            'stats_scope': cache.stats_scope,
+            'namespaces': _cache_namespace_stats()
+        },
+        'prefetch': prefetcher.stats(),
+        'json_encoder': app.json.encoder
     })
 
 # ==================== ERROR HANDLERS ====================
@@ -867,7 +1748,7 @@ if __name__ == '__main__':
     print("🚀 PawPal Web App - PRODUCTION MODE")
     print("="*60)
     print(f"📍 Web App Port: {port}")
-    print(f"📍 User Service: {USER_SERVICE_URL} (GCP VM)")
+    print(f"📍 User Service: {', '.join(USER_SERVICE_URLS)} (GCP VM)")
     print(f"📍 Swagger UI: {USER_SERVICE_URL}/api-docs")
     print(f"📍 Composite Service: {COMPOSITE_SERVICE_URL} (Local)")
     print("="*60)
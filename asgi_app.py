@@ -0,0 +1,777 @@
+"""Asyncio serving mode for the PawPal web app.
+
+Serves the same routes and JSON contracts as app.py, but as async views on an
+ASGI server:
+
+    hypercorn asgi_app:app --bind 0.0.0.0:5000 --workers 2
+
+Upstream calls go through the same ReplicaPool, using its pooled httpx client,
+so a worker never blocks while the user service answers. Routes that need
+several independent upstream calls (profile, stats seeding, health) issue
+them concurrently with asyncio.gather. Validation, formatting, the shared
+cache and the stats view all come from app.py, so both modes stay in step.
+
+Anything that can block, such as cache reads and writes (file I/O and
+lock waits with the SQLite backend), response encoding and walker ranking,
+runs in a worker thread via asyncio.to_thread so the event loop keeps
+serving other requests.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime
+
+import httpx
+from quart import Quart, abort, render_template, request, jsonify, session
+
+from jsonprovider import FastJSONProvider, entry_response
+
+import app as sync_app
+from app import (
+    cache, logger, prefetcher, user_service, COMPOSITE_SERVICE_URL, USER_SERVICE_URL,
+    USER_SERVICE_URLS, PET_FIELDS, PREFETCH_SOURCES, STATS_SOURCES, WALKER_CANDIDATE_PARAMS,
+    WALKER_FIELDS,
+    _cache_namespace_stats, _cached_response, _cached_stats_response, _cached_walker_columns,
+    _current_stats_view, _email_taken, _format_pet, _format_walker, _invalidate_prefetch,
+    _login_outcome, _new_dog_data, _prefetched, _profile_update_data, _project, _rank_walkers,
+    _ranked_walkers_payload, _ranking_options, _reconcile_stats, _requested_fields,
+    _requested_profile_fields, _shared_walker_candidates, _signup_outcome, _start_stats_reconciler,
+    _stats_dog_changed, _stats_from_responses, _stats_reconcile_event, _stats_response_key,
+    _stats_user_removed, _store_response, _store_walker_candidates, _upstream_params,
+    _user_service_health, _validate_signup, _walker_columns_from_entry, _walker_origin,
+    _walker_params, _walkers_changed, _walkers_response_key, _walkers_version
+)
+
+# Same templates, static files and SECRET_KEY as the Flask app, so session
+# cookies work across both modes
+app = Quart(__name__)
+app.config['SECRET_KEY'] = sync_app.app.config['SECRET_KEY']
+app.config['DEBUG'] = sync_app.app.config['DEBUG']
+app.json = FastJSONProvider(app)
+
+
+async def _request_json():
+    """The JSON body, like Flask's request.json: 415 unless the request is JSON"""
+    if not request.is_json:
+        abort(415)
+    return await request.get_json()
+
+
+async def _cached_jsonify(key, payload):
+    """jsonify(payload), keeping the encoded body for later hits on key"""
+    entry = await asyncio.to_thread(_store_response, key, payload, app.json)
+    return entry_response(app, entry, request)
+
+
+@app.after_request
+async def add_cors_headers(response):
+    """Reflect the caller's origin with credentials, like CORS(app, supports_credentials=True)"""
+    origin = request.headers.get('Origin')
+    if origin:
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Allow-Credentials'] = 'true'
+        response.vary.add('Origin')
+        if request.method == 'OPTIONS':
+            response.headers['Access-Control-Allow-Methods'] = response.headers.get(
+                'Allow', 'GET, POST, PUT, DELETE, OPTIONS'
+            )
+            requested_headers = request.headers.get('Access-Control-Request-Headers')
+            if requested_headers:
+                response.headers['Access-Control-Allow-Headers'] = requested_headers
+    return response
+
+
+@app.after_serving
+async def close_upstream_client():
+    await user_service.aclose()
+
+# Routes
+@app.route('/')
+async def index():
+    """Main application page"""
+    return await render_template('index.html')
+
+@app.route('/api/health')
+async def health():
+    """Health check endpoint"""
+    health_status = {
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat(),
+        'service': 'pawpal-web-app',
+        'environment': 'production',
+        'dependencies': {}
+    }
+
+    async def composite_health():
+        try:
+            response = await user_service.async_client().get(f'{COMPOSITE_SERVICE_URL}/health', timeout=2)
+            status = 'healthy' if response.status_code == 200 else 'unhealthy'
+        except httpx.HTTPError:
+            status = 'unavailable'
+        return {
+            'status': status,
+            'url': COMPOSITE_SERVICE_URL,
+            'deployment': 'local'
+        }
+    
+    # Replicas and the composite service are probed concurrently
+    probe_results, composite = await asyncio.gather(user_service.aprobe(timeout=5), composite_health())
+    health_status['dependencies']['user_service'] = _user_service_health(probe_results)
+    health_status['dependencies']['composite_service'] = composite
+    
+    return jsonify(health_status)
+
+# ==================== USER AUTHENTICATION ====================
+
+@app.route('/api/login', methods=['POST'])
+async def login():
+    """Handle user login using name and email"""
+    data = await _request_json()
+    name = data.get('name', '').strip()
+    email = data.get('email', '').strip().lower()
+    
+    if not name:
+        return jsonify({
+            'success': False,
+            'message': 'Name is required'
+        }), 400
+    
+    if not email:
+        return jsonify({
+            'success': False,
+            'message': 'Email is required'
+        }), 400
+    
+    logger.info(f"Login attempt - Name: {name}, Email: {email}")
+    
+    try:
+        # Search for user by email and verify name matches
+        response = await user_service.aget(
+            '/api/users/search',
+            params={'q': email},
+            timeout=10
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            payload, status = await asyncio.to_thread(
+                _login_outcome, result.get('data', []), name, email, session
+            )
+            return jsonify(payload), status
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Service error'
+            }), 500
+    
+    except httpx.HTTPError as e:
+        logger.error(f"Login error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f'User service error: {str(e)}'
+        }), 503
+
+@app.route('/api/signup', methods=['POST'])
+async def signup():
+    """Handle user registration with all required fields"""
+    user_data, error = _validate_signup(await _request_json())
+    if error:
+        return jsonify({
+            'success': False,
+            'message': error
+        }), 400
+    
+    try:
+        # Check if user already exists
+        search_response = await user_service.aget(
+            '/api/users/search',
+            params={'q': user_data['email']},
+            timeout=10
+        )
+        
+        if _email_taken(search_response, user_data['email']):
+            logger.info(f"User already exists: {user_data['email']}")
+            return jsonify({
+                'success': False,
+                'message': 'Email already exists. Please login instead or use a different email.'
+            }), 409
+        
+        logger.info(f"Creating user with data: {json.dumps(user_data, indent=2)}")
+        
+        # Create user on VM service
+        response = await user_service.apost(
+            '/api/users',
+            json=user_data,
+            headers={'Content-Type': 'application/json'},
+            timeout=10
+        )
+        
+        payload, status = await asyncio.to_thread(_signup_outcome, response, user_data, session)
+        return jsonify(payload), status
+    
+    except httpx.HTTPError as e:
+        logger.error(f"Signup error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f'Service error: {str(e)}'
+        }), 503
+
+@app.route('/api/logout', methods=['POST'])
+async def logout():
+    """Handle user logout"""
+    if 'user_id' in session:
+        await asyncio.to_thread(_invalidate_prefetch, session['user_id'])
+    session.clear()
+    return jsonify({
+        'success': True,
+        'message': 'Logged out successfully'
+    })
+
+@app.route('/api/current-user', methods=['GET'])
+async def current_user():
+    """Get current logged in user"""
+    if 'user_id' in session:
+        return jsonify({
+            'success': True,
+            'user': {
+                'id': session.get('user_id'),
+                'name': session.get('user_name'),
+                'email': session.get('user_email'),
+                'role': session.get('user_role')
+            }
+        })
+    else:
+        return jsonify({
+            'success': False,
+            'message': 'Not logged in'
+        }), 401
+
+# ==================== USER PROFILE ====================
+
+async def _working_set_section(user_id, section, params=None):
+    """Read a working-set section, from the prefetch cache when warm. Returns (status code, data)."""
+    data = await asyncio.to_thread(_prefetched, user_id, section)
+    if data is not None:
+        return 200, data
+    response = await user_service.aget(
+        PREFETCH_SOURCES[section].format(user_id=user_id),
+        params=params,
+        timeout=10
+    )
+    if response.status_code != 200:
+        return response.status_code, None
+    return 200, response.json().get('data')
+
+
+async def _skipped():
+    """Stand-in for a section the ?fields= projection left out"""
+    return None, None
+
+
+@app.route('/api/profile', methods=['GET', 'PUT', 'DELETE'])
+async def profile():
+    """Get, update, or delete user profile using VM Service"""
+    if 'user_id' not in session:
+        return jsonify({
+            'success': False,
+            'message': 'Please login first'
+        }), 401
+    
+    if request.method == 'GET':
+        try:
+            sections = _requested_profile_fields(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        user_id = session['user_id']
+        user_fields = sections.get('user', set()) if sections else None
+        dog_fields = sections.get('dogs') if sections else None
+        want_dogs = sections is None or 'dogs' in sections
+        want_stats = sections is None or 'stats' in sections
+        
+        try:
+            # The user, dogs and stats lookups are independent, so send them together
+            (status, user), (_, dogs), (_, stats) = await asyncio.gather(
+                _working_set_section(user_id, 'user', _upstream_params(user_fields)),
+                _working_set_section(user_id, 'dogs', _upstream_params(dog_fields))
+                if want_dogs else _skipped(),
+                _working_set_section(user_id, 'stats')
+                if want_stats else _skipped()
+            )
+            
+            if status == 200:
+                profile_data = {}
+                if sections is None or 'user' in sections:
+                    profile_data['user'] = _project(user or {}, user_fields)
+                if want_dogs:
+                    profile_data['dogs'] = [_project(dog, dog_fields) for dog in dogs or []]
+                if want_stats:
+                    profile_data['stats'] = _project(stats or {}, sections.get('stats') if sections else None)
+                
+                return jsonify({
+                    'success': True,
+                    'data': profile_data
+                })
+            else:
+                return jsonify({
+                    'success': False,
+                    'message': 'Failed to get profile'
+                }), status
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Get profile error: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': f'Service error: {str(e)}'
+            }), 503
+    
+    elif request.method == 'PUT':
+        update_data = _profile_update_data(await _request_json())
+        try:
+            response = await user_service.aput(
+                f'/api/users/{session["user_id"]}',
+                json=update_data,
+                headers={'Content-Type': 'application/json'},
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                updated_user = result.get('data', {})
+                
+                # Update session
+                if 'name' in updated_user:
+                    session['user_name'] = updated_user['name']
+                await asyncio.to_thread(_invalidate_prefetch, session['user_id'], 'user')
+                await asyncio.to_thread(_walkers_changed, session.get('user_role'))
+                
+                return jsonify({
+                    'success': True,
+                    'message': 'Profile updated successfully',
+                    'user': updated_user
+                })
+            else:
+                return jsonify({
+                    'success': False,
+                    'message': 'Failed to update profile'
+                }), response.status_code
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Update profile error: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': f'Service error: {str(e)}'
+            }), 503
+    
+    else:  # DELETE
+        try:
+            # Soft delete user
+            response = await user_service.adelete(
+                f'/api/users/{session["user_id"]}',
+                timeout=10
+            )
+            
+            if response.status_code in [200, 204]:
+                await asyncio.to_thread(_stats_user_removed, session.get('user_role'))
+                await asyncio.to_thread(_walkers_changed, session.get('user_role'))
+                await asyncio.to_thread(_invalidate_prefetch, session['user_id'])
+                session.clear()
+                return jsonify({
+                    'success': True,
+                    'message': 'Account deactivated successfully'
+                })
+            else:
+                return jsonify({
+                    'success': False,
+                    'message': 'Failed to delete account'
+                }), response.status_code
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Delete profile error: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': f'Service error: {str(e)}'
+            }), 503
+
+# ==================== PET MANAGEMENT ====================
+
+@app.route('/api/pets', methods=['GET', 'POST'])
+async def pets():
+    """Handle pet management using VM User Service"""
+    if request.method == 'POST':
+        if 'user_id' not in session:
+            return jsonify({
+                'success': False,
+                'message': 'Please login first'
+            }), 401
+        
+        data = await _request_json()
+        logger.info(f"Adding new pet: {data.get('name')}")
+        
+        try:
+            dog_data = _new_dog_data(data, session['user_id'])
+            
+            # Create dog on VM service
+            response = await user_service.apost(
+                '/api/dogs',
+                json=dog_data,
+                headers={'Content-Type': 'application/json'},
+                timeout=10
+            )
+            
+            if response.status_code in [200, 201]:
+                result = response.json()
+                created_dog = result.get('data') or dog_data
+                await asyncio.to_thread(_stats_dog_changed, None, created_dog)
+                await asyncio.to_thread(_invalidate_prefetch, session['user_id'], 'dogs', 'stats')
+                return jsonify({
+                    'success': True,
+                    'message': 'Pet added successfully',
+                    'data': result.get('data', result)
+                })
+            else:
+                error_msg = response.json().get('message', 'Failed to add pet')
+                return jsonify({
+                    'success': False,
+                    'message': error_msg
+                }), response.status_code
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Add pet error: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': f'Service error: {str(e)}'
+            }), 503
+    
+    else:  # GET
+        try:
+            fields = _requested_fields(PET_FIELDS, request.args)
+        except ValueError as e:
+            return jsonify({'pets': [], 'message': str(e)}), 400
+        
+        if 'user_id' not in session:
+            return jsonify({'pets': []})
+        
+        try:
+            # Get user's dogs from VM service (or the post-login prefetch)
+            status, dogs = await _working_set_section(
+                session['user_id'], 'dogs', _upstream_params(fields, PET_FIELDS)
+            )
+            
+            if status == 200:
+                pets_formatted = [_project(_format_pet(dog), fields) for dog in dogs or []]
+                
+                return jsonify({'pets': pets_formatted})
+            else:
+                return jsonify({'pets': []})
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Get pets error: {str(e)}")
+            return jsonify({'pets': []})
+
+
+async def _get_dog(pet_id):
+    """Fetch a single dog record, or None if it cannot be read"""
+    try:
+        response = await user_service.aget(f'/api/dogs/{pet_id}', timeout=10)
+        if response.status_code == 200:
+            return response.json().get('data')
+    except httpx.HTTPError as e:
+        logger.warning(f"Get dog {pet_id} error: {str(e)}")
+    return None
+
+
+@app.route('/api/pets/<int:pet_id>', methods=['PUT', 'DELETE'])
+async def manage_pet(pet_id):
+    """Update or delete a specific pet using VM Service"""
+    if 'user_id' not in session:
+        return jsonify({
+            'success': False,
+            'message': 'Please login first'
+        }), 401
+    
+    # Snapshot the dog before changing it so the stats view can be adjusted
+    view = await asyncio.to_thread(cache.get, 'stats', 'view')
+    old_dog = await _get_dog(pet_id) if view is not None else None
+    
+    if request.method == 'PUT':
+        data = await _request_json()
+        try:
+            response = await user_service.aput(
+                f'/api/dogs/{pet_id}',
+                json=data,
+                headers={'Content-Type': 'application/json'},
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                if old_dog is not None:
+                    await asyncio.to_thread(_stats_dog_changed, old_dog, {**old_dog, **result.get('data', data)})
+                else:
+                    _stats_reconcile_event.set()
+                await asyncio.to_thread(_invalidate_prefetch, session['user_id'], 'dogs', 'stats')
+                return jsonify({
+                    'success': True,
+                    'message': 'Pet updated successfully',
+                    'data': result.get('data', {})
+                })
+            else:
+                return jsonify({
+                    'success': False,
+                    'message': 'Failed to update pet'
+                }), response.status_code
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Update pet error: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': f'Service error: {str(e)}'
+            }), 503
+    
+    else:  # DELETE
+        try:
+            response = await user_service.adelete(
+                f'/api/dogs/{pet_id}',
+                timeout=10
+            )
+            
+            if response.status_code in [200, 204]:
+                if old_dog is not None:
+                    await asyncio.to_thread(_stats_dog_changed, old_dog, None)
+                else:
+                    _stats_reconcile_event.set()
+                await asyncio.to_thread(_invalidate_prefetch, session['user_id'], 'dogs', 'stats')
+                return jsonify({
+                    'success': True,
+                    'message': 'Pet deleted successfully'
+                })
+            else:
+                return jsonify({
+                    'success': False,
+                    'message': 'Failed to delete pet'
+                }), response.status_code
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Delete pet error: {str(e)}")
+            return jsonify({
+                'success': False,
+                'message': f'Service error: {str(e)}'
+            }), 503
+
+# ==================== STATISTICS ====================
+
+async def _ensure_stats_view():
+    """Return the view, seeding it from all STATS_SOURCES at once on first use"""
+    view = await asyncio.to_thread(_current_stats_view)
+    if view is None:
+        responses = await asyncio.gather(*(
+            user_service.aget(path, params=params, timeout=10) for path, params in STATS_SOURCES
+        ))
+        view = await asyncio.to_thread(_reconcile_stats, _stats_from_responses(*responses))
+    # Periodic reconciliation stays on the shared background thread
+    _start_stats_reconciler()
+    return view
+
+
+@app.route('/api/stats', methods=['GET'])
+async def get_stats():
+    """Get statistics from the materialized stats view"""
+    entry = await asyncio.to_thread(_cached_stats_response)
+    if entry is not None:
+        _start_stats_reconciler()
+        return entry_response(app, entry, request)
+    
+    try:
+        view = await _ensure_stats_view()
+        payload = {
+            'success': True,
+            'stats': view['stats']
+        }
+        if view['version'] is None:
+            # Partial snapshot from a failed seed: serve it, but don't cache it
+            return jsonify(payload)
+        
+        return await _cached_jsonify(_stats_response_key(view['version']), payload)
+    
+    except httpx.HTTPError as e:
+        logger.error(f"Get stats error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f'Service error: {str(e)}'
+        }), 503
+
+# ==================== WALKER SEARCH ====================
+
+async def _load_walker_candidates():
+    """Return the columnar walker candidate set, refreshing it when stale"""
+    version = await asyncio.to_thread(_walkers_version)
+    columns = _cached_walker_columns(version)
+    if columns is not None:
+        return columns
+    
+    entry = await asyncio.to_thread(_shared_walker_candidates, version)
+    if entry is None:
+        response = await user_service.aget(
+            '/api/users',
+            params=WALKER_CANDIDATE_PARAMS,
+            timeout=10
+        )
+        entry = await asyncio.to_thread(_store_walker_candidates, response, version)
+    # Building the columns and grid is CPU work; keep it off the event loop
+    return await asyncio.to_thread(_walker_columns_from_entry, entry)
+
+
+@app.route('/api/walkers', methods=['GET'])
+async def get_walkers():
+    """Get available walkers from VM User Service"""
+    sort = request.args.get('sort')
+    
+    try:
+        fields = _requested_fields(WALKER_FIELDS, request.args)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'message': str(e)
+        }), 400
+    
+    origin, default_radius, error = _walker_origin(request.args)
+    if error:
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'message': error
+        }), 400
+    
+    cache_key = await asyncio.to_thread(_walkers_response_key, request.args)
+    entry = await asyncio.to_thread(_cached_response, cache_key)
+    if entry is not None:
+        return entry_response(app, entry, request)
+    
+    if sort or origin:
+        return await _get_ranked_walkers(sort, origin, default_radius, fields, cache_key)
+    
+    try:
+        response = await user_service.aget(
+            '/api/users',
+            params=_walker_params(request.args, fields),
+            timeout=10
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            walkers = result.get('data', [])
+            
+            walkers_formatted = [_project(_format_walker(walker), fields) for walker in walkers]
+            
+            return await _cached_jsonify(cache_key, {
+                'success': True,
+                'walkers': walkers_formatted,
+                'total': result.get('total', len(walkers))
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'walkers': []
+            })
+    
+    except httpx.HTTPError as e:
+        logger.error(f"Get walkers error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'error': str(e)
+        })
+
+
+async def _get_ranked_walkers(sort, origin=None, default_radius=None, fields=None, cache_key=None):
+    """Handle /api/walkers?sort=... and proximity searches using the ranking engine"""
+    options, error = _ranking_options(request.args, sort, default_radius)
+    if error:
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'message': error
+        }), 400
+    
+    try:
+        columns = await _load_walker_candidates()
+        # Ranking is CPU work; keep it off the event loop
+        ranked = await asyncio.to_thread(_rank_walkers, columns, origin=origin, **options)
+        payload = _ranked_walkers_payload(ranked, sort, origin, fields)
+        if cache_key is None:
+            return jsonify(payload)
+        return await _cached_jsonify(cache_key, payload)
+    
+    except httpx.HTTPError as e:
+        logger.error(f"Rank walkers error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'walkers': [],
+            'error': str(e)
+        })
+
+# ==================== VM SERVICE INFO ====================
+
+@app.route('/api/service-info', methods=['GET'])
+async def service_info():
+    """Get VM Service information and status"""
+    cache_stats = await asyncio.to_thread(_cache_namespace_stats)
+    return jsonify({
+        'user_service': {
+            'url': USER_SERVICE_URL,
+            'replicas': user_service.snapshot(),
+            'balance_policy': user_service.policy,
+            'swagger_ui': f'{USER_SERVICE_URL}/api-docs',
+            'swagger_json': f'{USER_SERVICE_URL}/api-docs/swagger.json',
+            'deployment': 'GCP Compute Engine VM',
+            'database': 'MariaDB (local on VM)',
+            'port': 3001
+        },
+        'composite_service': {
+            'url': COMPOSITE_SERVICE_URL,
+            'deployment': 'Local (for development)',
+            'port': 3002
+        },
+        'cache': {
+            'backend': cache.name,
+            'worker_pid': os.getpid(),
+            # 'process' counts only the worker that answered; 'host' counts them all
+            'stats_scope': cache.stats_scope,
+            'namespaces': cache_stats
+        },
+        'prefetch': prefetcher.stats(),
+        'json_encoder': app.json.encoder
+    })
+
+# ==================== ERROR HANDLERS ====================
+
+@app.errorhandler(404)
+async def not_found(error):
+    return jsonify({'error': 'Not found'}), 404
+
+@app.errorhandler(500)
+async def internal_error(error):
+    logger.error(f"Internal error: {error}")
+    return jsonify({'error': 'Internal server error'}), 500
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    
+    print("\n" + "="*60)
+    print("🚀 PawPal Web App - ASYNCIO MODE")
+    print("="*60)
+    print(f"📍 Web App Port: {port}")
+    print(f"📍 User Service: {', '.join(USER_SERVICE_URLS)} (GCP VM)")
+    print(f"📍 Composite Service: {COMPOSITE_SERVICE_URL} (Local)")
+    print("="*60 + "\n")
+    
+    app.run(
+        host='0.0.0.0',
+        port=port,
+        debug=app.config['DEBUG']
+    )
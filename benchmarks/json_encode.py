@@ -0,0 +1,99 @@
+"""Micro-benchmark: JSON encode cost per route.
+
+For a representative payload of each route, times
+- stdlib: Flask's default provider building the response
+- fast: FastJSONProvider (orjson when installed) building the response
+- gzip: compressing the encoded body, as a cache miss does for large bodies
+- hit: serving the pre-encoded entry from the response cache
+
+Payloads are synthetic, so no services need to be running:
+
+    python benchmarks/json_encode.py [--walkers 500] [--number 200]
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+
+import app as webapp
+from jsonprovider import encode_entry, entry_response
+
+
+def _walker(i):
+    return {
+        'id': i,
+        'name': f'Walker {i}',
+        'rating': round(random.uniform(3, 5), 2),
+        'total_reviews': random.randint(0, 400),
+        'location': random.choice(['Brooklyn, NY', 'Queens, NY', 'Jersey City, NJ']),
+        'bio': 'Experienced with large breeds and puppies. ' * 3,
+        'price': random.randint(15, 45)
+    }
+
+
+def route_payloads(walkers):
+    """One realistic response body per cached or hot route"""
+    walker_list = [webapp._format_walker(_walker(i)) for i in range(walkers)]
+    breeds = [{'breed': f'Breed {i}', 'count': random.randint(1, 50)} for i in range(120)]
+    return {
+        '/api/walkers (20)': {'success': True, 'walkers': walker_list[:20], 'total': walkers},
+        f'/api/walkers?sort=best&limit={walkers}': {
+            'success': True,
+            'walkers': [dict(w, distance_km=round(random.uniform(0, 10), 2)) for w in walker_list],
+            'total': walkers,
+            'sort': 'best'
+        },
+        '/api/stats': {
+            'success': True,
+            'stats': {
+                'totalUsers': 5321,
+                'totalDogs': sum(b['count'] for b in breeds),
+                'owners': 4100,
+                'walkers': 1221,
+                'breeds': breeds,
+                'sizes': [{'size': s, 'count': random.randint(100, 900)} for s in ('small', 'medium', 'large')]
+            }
+        },
+        '/api/pets': {'pets': [webapp._format_pet({'id': i, 'name': f'Dog {i}', 'breed': 'Lab'}) for i in range(5)]}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--walkers', type=int, default=500, help='walkers in the ranked payload')
+    parser.add_argument('--number', type=int, default=200, help='iterations per measurement')
+    args = parser.parse_args()
+
+    random.seed(1)
+    flask_app = webapp.app
+    stdlib = DefaultJSONProvider(flask_app)
+    fast = flask_app.json
+
+    print(f'encoder: {fast.encoder}, debug (indented output): {flask_app.debug}')
+    print(f"{'route':<36}{'bytes':>9}{'stdlib us':>12}{'fast us':>10}{'gzip us':>10}{'hit us':>9}")
+    with flask_app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        for route, payload in route_payloads(args.walkers).items():
+            entry = encode_entry(fast, payload, gzip_min_bytes=webapp.RESPONSE_GZIP_MIN_BYTES)
+            webapp.response_cache.set('responses', route, entry, ttl=60)
+            body = entry['body']
+
+            def per_call(fn):
+                return timeit.timeit(fn, number=args.number) / args.number * 1e6
+
+            timings = (
+                per_call(lambda: stdlib.response(payload)),
+                per_call(lambda: fast.response(payload)),
+                per_call(lambda: gzip.compress(body, compresslevel=6)),
+                per_call(lambda: entry_response(flask_app, webapp.response_cache.get('responses', route), webapp.request))
+            )
+            print(f'{route:<36}{len(body):>9}' + ''.join(f'{t:>{w}.1f}' for t, w in zip(timings, (12, 10, 10, 9))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,334 @@
+"""Pluggable cache backends shared by the web app's namespaces.
+
+LRUCache lives in one process. SQLiteCache keeps entries in a WAL-mode SQLite
+file, so every gunicorn worker on the host reads and writes the same data.
+Entries carry an optional TTL.
+
+The SQLite file is private to the user running the app (0600, in a 0700
+directory by default) and holds JSON, never pickles, so a row someone else
+managed to write cannot run code when it is read back.
+"""
+import base64
+import getpass
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+def _encode_default(o):
+    if isinstance(o, (bytes, bytearray)):
+        return {'__bytes__': base64.b64encode(o).decode('ascii')}
+    raise TypeError(f'Object of type {type(o).__name__} cannot be cached')
+
+
+def _decode_hook(d):
+    if len(d) == 1 and '__bytes__' in d:
+        return base64.b64decode(d['__bytes__'])
+    return d
+
+
+def _dumps(value):
+    """Serialize a cache value: JSON, with bytes carried as base64"""
+    return json.dumps(value, separators=(',', ':'), default=_encode_default).encode('utf-8')
+
+
+def _loads(blob):
+    return json.loads(blob, object_hook=_decode_hook)
+
+
+def _private_dir(path):
+    """Create path as a 0700 directory, refusing one another user owns or can write"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    getuid = getattr(os, 'getuid', None)
+    if getuid is not None:
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != getuid():
+            raise RuntimeError(f'Cache directory {path} is not a directory owned by this user')
+        if st.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    return path
+
+
+def _private_file(path):
+    """Create path as a 0600 file, refusing one another user owns"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+    try:
+        st = os.fstat(fd)
+        getuid = getattr(os, 'getuid', None)
+        if getuid is not None:
+            if st.st_uid != getuid():
+                raise RuntimeError(f'Cache file {path} is owned by another user')
+            if st.st_mode & 0o077:
+                os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+
+
+class CacheBackend:
+    """Namespaced key/value cache with TTLs and per-namespace hit/miss counters"""
+
+    name = 'base'
+    # Whose traffic stats() covers: 'process' or 'host'
+    stats_scope = 'process'
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+
+    def _record(self, namespace, hit):
+        with self._stats_lock:
+            counters = self._stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+            counters['hits' if hit else 'misses'] += 1
+
+    @staticmethod
+    def _report(counts):
+        """Shape {namespace: (hits, misses)} with hit rates"""
+        report = {}
+        for namespace, (hits, misses) in counts.items():
+            total = hits + misses
+            report[namespace] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / total, 4) if total else 0.0
+            }
+        return report
+
+    def stats(self):
+        """Hit/miss counts and hit rate per namespace, over stats_scope"""
+        with self._stats_lock:
+            return self._report({ns: (c['hits'], c['misses']) for ns, c in self._stats.items()})
+
+    def get(self, namespace, key, default=None):
+        raise NotImplementedError
+
+    def set(self, namespace, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, namespace, key):
+        raise NotImplementedError
+
+    def update(self, namespace, key, fn, ttl=None):
+        """Atomically replace a value with fn(current value).
+
+        Nothing is written when the key is missing or fn returns None.
+        """
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """In-process cache evicting the least recently used entry past max_entries"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1024):
+        super().__init__()
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def _live(self, full_key):
+        """Return the entry for full_key, dropping it if expired. Caller holds the lock."""
+        entry = self._entries.get(full_key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[full_key]
+            return None
+        self._entries.move_to_end(full_key)
+        return entry
+
+    def get(self, namespace, key, default=None):
+        with self._lock:
+            entry = self._live((namespace, key))
+        self._record(namespace, entry is not None)
+        return entry[0] if entry is not None else default
+
+    def set(self, namespace, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[(namespace, key)] = (value, expires_at)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+
+    def update(self, namespace, key, fn, ttl=None):
+        with self._lock:
+            entry = self._live((namespace, key))
+            if entry is None:
+                return None
+            value = fn(entry[0])
+            if value is not None:
+                expires_at = time.monotonic() + ttl if ttl else entry[1]
+                self._entries[(namespace, key)] = (value, expires_at)
+            return value
+
+
+class SQLiteCache(CacheBackend):
+    """Host-shared cache in a WAL-mode SQLite file.
+
+    Each thread gets its own connection. Expired rows are skipped on read and
+    purged every purge_interval seconds; past max_entries the rows closest to
+    expiry go first. Hit/miss counts are batched per process and added to a
+    shared counters table every counter_interval seconds, so stats() covers
+    every worker on the host.
+    """
+
+    name = 'sqlite'
+    stats_scope = 'host'
+
+    def __init__(self, path, max_entries=10000, purge_interval=60, counter_interval=5):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.purge_interval = purge_interval
+        self.counter_interval = counter_interval
+        self._local = threading.local()
+        self._last_purge = 0.0
+        self._last_flush = 0.0
+
+        _private_file(path)
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                ' namespace TEXT NOT NULL,'
+                ' key TEXT NOT NULL,'
+                ' value BLOB NOT NULL,'
+                ' expires_at REAL,'
+                ' PRIMARY KEY (namespace, key)'
+                ') WITHOUT ROWID'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS counters ('
+                ' namespace TEXT PRIMARY KEY,'
+                ' hits INTEGER NOT NULL,'
+                ' misses INTEGER NOT NULL'
+                ') WITHOUT ROWID'
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork (gunicorn --preload), so key them by pid
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _maybe_purge(self, conn):
+        now = time.time()
+        if now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+        conn.execute('DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+        conn.execute(
+            'DELETE FROM cache WHERE (namespace, key) IN ('
+            ' SELECT namespace, key FROM cache'
+            ' ORDER BY COALESCE(expires_at, 1e18) DESC'
+            ' LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def _flush_counters(self, conn):
+        """Add this process's pending hit/miss counts to the shared table"""
+        self._last_flush = time.time()
+        with self._stats_lock:
+            pending, self._stats = self._stats, {}
+        if pending:
+            conn.executemany(
+                'INSERT INTO counters (namespace, hits, misses) VALUES (?, ?, ?)'
+                ' ON CONFLICT (namespace) DO UPDATE SET'
+                ' hits = hits + excluded.hits, misses = misses + excluded.misses',
+                [(ns, c['hits'], c['misses']) for ns, c in pending.items()]
+            )
+
+    def stats(self):
+        conn = self._conn()
+        self._flush_counters(conn)
+        rows = conn.execute('SELECT namespace, hits, misses FROM counters').fetchall()
+        return self._report({namespace: (hits, misses) for namespace, hits, misses in rows})
+
+    @staticmethod
+    def _decode(row):
+        """The value in a row, or None for a missing or unreadable one"""
+        if row is None:
+            return None
+        try:
+            return _loads(row[0])
+        except ValueError:
+            return None
+
+    def get(self, namespace, key, default=None):
+        row = self._conn().execute(
+            'SELECT value FROM cache WHERE namespace = ? AND key = ?'
+            ' AND (expires_at IS NULL OR expires_at > ?)',
+            (namespace, key, time.time())
+        ).fetchone()
+        value = self._decode(row)
+        self._record(namespace, value is not None)
+        if time.time() - self._last_flush >= self.counter_interval:
+            self._flush_counters(self._conn())
+        return value if value is not None else default
+
+    def set(self, namespace, key, value, ttl=None):
+        conn = self._conn()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)',
+            (namespace, key, _dumps(value), time.time() + ttl if ttl else None)
+        )
+        self._maybe_purge(conn)
+
+    def delete(self, namespace, key):
+        self._conn().execute('DELETE FROM cache WHERE namespace = ? AND key = ?', (namespace, key))
+
+    def update(self, namespace, key, fn, ttl=None):
+        conn = self._conn()
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent updates serialize
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?'
+                ' AND (expires_at IS NULL OR expires_at > ?)',
+                (namespace, key, time.time())
+            ).fetchone()
+            current = self._decode(row)
+            value = fn(current) if current is not None else None
+            if value is not None:
+                conn.execute(
+                    'UPDATE cache SET value = ?, expires_at = ? WHERE namespace = ? AND key = ?',
+                    (_dumps(value), time.time() + ttl if ttl else row[1], namespace, key)
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return value
+
+
+def create_cache(backend=None, path=None, max_entries=None, name='cache'):
+    """Build the cache backend named by backend ('memory' or 'sqlite').
+
+    Separate caches need separate SQLite files, since max_entries applies to
+    the whole file; name picks the file in the default directory.
+    """
+    backend = (backend or 'memory').lower()
+    if backend == 'sqlite':
+        if not path:
+            directory = _private_dir(os.path.join(tempfile.gettempdir(), f'pawpal-cache-{getpass.getuser()}'))
+            path = os.path.join(directory, f'{name}.sqlite3')
+        return SQLiteCache(path, max_entries=max_entries or 10000)
+    if backend == 'memory':
+        return LRUCache(max_entries=max_entries or 1024)
+    raise ValueError(f'Unknown cache backend: {backend}')
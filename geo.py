@@ -0,0 +1,220 @@
+"""Offline location resolution and a grid-based spatial index for walker search"""
+import json
+import math
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+GAZETTEER_PATH = os.environ.get(
+    'GAZETTEER_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer.json')
+)
+
+_COORDINATE_PATTERN = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+def normalize_location(text):
+    """Lowercase, drop punctuation and collapse whitespace: 'Brooklyn,  NY.' -> 'brooklyn, ny'"""
+    text = re.sub(r'[^\w\s,]', '', text.lower())
+    parts = [' '.join(part.split()) for part in text.split(',')]
+    return ', '.join(part for part in parts if part)
+
+
+@lru_cache(maxsize=1)
+def _load_gazetteer():
+    """Build the lookup tables from the gazetteer file.
+
+    Returns (places, cities): normalized "city, st" -> (lat, lon), and bare
+    city name or alias -> (qualifier, (lat, lon)) for the first entry seen.
+    """
+    places, cities = {}, {}
+    try:
+        with open(GAZETTEER_PATH) as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return places, cities
+
+    for place in entries:
+        coords = (float(place['lat']), float(place['lon']))
+        name = normalize_location(place['name'])
+        city, _, qualifier = name.partition(', ')
+        places[name] = coords
+        cities.setdefault(city, (qualifier, coords))
+        for alias in place.get('aliases', []):
+            cities.setdefault(normalize_location(alias), (qualifier, coords))
+    return places, cities
+
+
+@lru_cache(maxsize=4096)
+def resolve_location(text):
+    """Resolve a location string or 'lat,lon' literal to (lat, lon), or None"""
+    if not text:
+        return None
+
+    match = _COORDINATE_PATTERN.match(text)
+    if match:
+        lat, lon = float(match.group(1)), float(match.group(2))
+        if -90 <= lat <= 90 and -180 <= lon <= 180:
+            return (lat, lon)
+        return None
+
+    places, cities = _load_gazetteer()
+    parts = normalize_location(text).split(', ')
+    # Try "brooklyn, ny, usa", then "brooklyn, ny"
+    for end in range(len(parts), 1, -1):
+        coords = places.get(', '.join(parts[:end]))
+        if coords:
+            return coords
+    # A bare city only matches when no qualifier was given or it agrees:
+    # "Portland, ME" must not resolve to Portland, OR
+    city = cities.get(parts[0])
+    if city and (len(parts) == 1 or parts[1] == city[0]):
+        return city[1]
+    return None
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distance in km from one point to arrays of points"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """Fixed-size lat/lon grid over point positions.
+
+    Each cell holds the row indices of the points that fall in it, so radius
+    and nearest-neighbour queries only look at the cells around the origin
+    instead of scanning every point.
+    """
+
+    def __init__(self, lats, lons, cell_deg=0.05):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.cell_deg = cell_deg
+        self.cells = {}
+
+        valid = np.flatnonzero(~(np.isnan(self.lats) | np.isnan(self.lons)))
+        rows = np.floor(self.lats[valid] / cell_deg).astype(np.int64)
+        cols = np.floor(self.lons[valid] / cell_deg).astype(np.int64)
+        buckets = {}
+        for i, row, col in zip(valid.tolist(), rows.tolist(), cols.tolist()):
+            buckets.setdefault((row, col), []).append(i)
+        self.cells = {cell: np.array(ids, dtype=np.int64) for cell, ids in buckets.items()}
+
+        if self.cells:
+            cell_rows = [cell[0] for cell in self.cells]
+            cell_cols = [cell[1] for cell in self.cells]
+            self._bounds = (min(cell_rows), max(cell_rows), min(cell_cols), max(cell_cols))
+        else:
+            self._bounds = None
+
+    def __len__(self):
+        return sum(ids.size for ids in self.cells.values())
+
+    def _cell_of(self, lat, lon):
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def _gather(self, cells, mask=None):
+        """Concatenate the point indices held by the given cells, keeping only masked rows"""
+        found = [self.cells[cell] for cell in cells if cell in self.cells]
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        ids = np.concatenate(found)
+        return ids[mask[ids]] if mask is not None else ids
+
+    def within(self, lat, lon, radius_km, mask=None):
+        """Indices and distances of points within radius_km, nearest first.
+
+        mask, if given, is a boolean array over all points; False rows are skipped.
+        """
+        if self._bounds is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        lon_span = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        row_lo, col_lo = self._cell_of(lat - lat_span, lon - lon_span)
+        row_hi, col_hi = self._cell_of(lat + lat_span, lon + lon_span)
+        min_row, max_row, min_col, max_col = self._bounds
+
+        row_lo, row_hi = max(row_lo, min_row), min(row_hi, max_row)
+        col_lo, col_hi = max(col_lo, min_col), min(col_hi, max_col)
+        if (row_hi - row_lo + 1) * (col_hi - col_lo + 1) > len(self.cells):
+            # Huge radius: cheaper to filter the occupied cells than enumerate the box
+            cells = [cell for cell in self.cells
+                     if row_lo <= cell[0] <= row_hi and col_lo <= cell[1] <= col_hi]
+        else:
+            cells = [(row, col)
+                     for row in range(row_lo, row_hi + 1)
+                     for col in range(col_lo, col_hi + 1)]
+        ids = self._gather(cells, mask)
+        distances = haversine_km(lat, lon, self.lats[ids], self.lons[ids])
+        keep = distances <= radius_km
+        ids, distances = ids[keep], distances[keep]
+        order = np.argsort(distances, kind='stable')
+        return ids[order], distances[order]
+
+    def nearest(self, lat, lon, k, mask=None):
+        """Indices and distances of the k nearest points, nearest first"""
+        if self._bounds is None or k < 1:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        origin_row, origin_col = self._cell_of(lat, lon)
+        min_row, max_row, min_col, max_col = self._bounds
+        max_ring = max(abs(origin_row - min_row), abs(origin_row - max_row),
+                       abs(origin_col - min_col), abs(origin_col - max_col))
+        # Narrowest cell dimension near the origin, used to bound unvisited rings
+        cell_km = self.cell_deg * KM_PER_DEGREE_LAT * min(1.0, max(math.cos(math.radians(lat)), 1e-6))
+
+        ids_found = []
+        dist_found = []
+        count = 0
+        for ring in range(max_ring + 1):
+            if (2 * ring + 1) ** 2 > 4 * len(self.cells):
+                # Sparse grid far from the origin: one vectorized pass is cheaper
+                return self._nearest_scan(lat, lon, k, mask)
+            if ring == 0:
+                cells = [(origin_row, origin_col)]
+            else:
+                cells = [(origin_row + dr, origin_col + dc)
+                         for dr in range(-ring, ring + 1)
+                         for dc in (range(-ring, ring + 1) if abs(dr) == ring else (-ring, ring))]
+            ids = self._gather(cells, mask)
+            if ids.size:
+                ids_found.append(ids)
+                dist_found.append(haversine_km(lat, lon, self.lats[ids], self.lons[ids]))
+                count += ids.size
+
+            # Anything outside this ring is at least ring * cell_km away
+            if count >= k:
+                distances = np.concatenate(dist_found)
+                kth = np.partition(distances, k - 1)[k - 1]
+                if kth <= ring * cell_km:
+                    break
+
+        if not ids_found:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return self._top_k(np.concatenate(ids_found), np.concatenate(dist_found), k)
+
+    def _nearest_scan(self, lat, lon, k, mask=None):
+        """k nearest by computing the distance to every indexed point"""
+        ids = self._gather(self.cells.keys(), mask)
+        distances = haversine_km(lat, lon, self.lats[ids], self.lons[ids])
+        return self._top_k(ids, distances, k)
+
+    @staticmethod
+    def _top_k(ids, distances, k):
+        """The k smallest distances, sorted, via partial selection"""
+        if k < ids.size:
+            part = np.argpartition(distances, k - 1)[:k]
+        else:
+            part = np.arange(ids.size)
+        order = part[np.argsort(distances[part], kind='stable')]
+        return ids[order], distances[order]
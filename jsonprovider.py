@@ -0,0 +1,87 @@
+"""Faster JSON encoding for the web app, and pre-encoded cached responses.
+
+FastJSONProvider encodes with orjson when it is installed and falls back to
+the stdlib otherwise, or for anything orjson refuses (e.g. integers wider
+than 64 bits). Output keeps Flask's conventions: sorted keys, compact
+separators (indented in debug mode), dates as HTTP dates. Non-ASCII text is
+sent as UTF-8 rather than \\u escapes.
+
+encode_entry() and entry_response() let a route cache its response as the
+final bytes, with a gzip copy for larger bodies, so a hit skips both
+serialization and compression.
+"""
+import gzip
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS |
+                       orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson as the encoder when available"""
+
+    encoder = 'orjson' if orjson is not None else 'json'
+
+    def _pretty(self):
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def dumps_bytes(self, obj, pretty=None):
+        """Encode obj to the exact bytes jsonify would send, trailing newline included"""
+        if pretty is None:
+            pretty = self._pretty()
+        if orjson is not None:
+            option = _ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=self.default, option=option)
+            except TypeError:
+                pass
+        dump_args = {'indent': 2} if pretty else {'separators': (',', ':')}
+        return f'{super().dumps(obj, **dump_args)}\n'.encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        # Callers passing json.dumps options (e.g. the session serializer) get the stdlib
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS).decode('utf-8')
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def encode_entry(provider, obj, gzip_min_bytes=1024):
+    """Encode obj once for caching: {'body': bytes, 'gzip': bytes or None}"""
+    body = provider.dumps_bytes(obj)
+    compressed = None
+    if gzip_min_bytes is not None and len(body) >= gzip_min_bytes:
+        compressed = gzip.compress(body, compresslevel=6)
+    return {'body': body, 'gzip': compressed}
+
+
+def entry_response(app, entry, request):
+    """Response for a cached entry, sending the gzip copy to clients that accept it"""
+    if entry['gzip'] is not None and request.accept_encodings['gzip'] > 0:
+        response = app.response_class(entry['gzip'], mimetype=app.json.mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(entry['body'], mimetype=app.json.mimetype)
+    if entry['gzip'] is not None:
+        response.vary.add('Accept-Encoding')
+    return response
@@ -0,0 +1,56 @@
+"""Bounded background executor for best-effort prefetching.
+
+Prefetches only warm a cache, so they are never worth queueing behind: once
+max_pending jobs are running or waiting, new ones are dropped instead.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Run fire-and-forget jobs on a small thread pool, shedding them under load"""
+
+    def __init__(self, max_workers=2, max_pending=8):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._lock = threading.Lock()
+        self._counts = {'submitted': 0, 'dropped': 0, 'completed': 0, 'failed': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._counts[key] += 1
+
+    def submit(self, fn, *args):
+        """Schedule fn(*args). Returns False, without running it, when at capacity."""
+        if not self._slots.acquire(blocking=False):
+            self._count('dropped')
+            return False
+        self._count('submitted')
+        try:
+            self._executor.submit(self._run, fn, args)
+        except RuntimeError:
+            # Executor shut down, e.g. at interpreter exit
+            self._slots.release()
+            self._count('dropped')
+            return False
+        return True
+
+    def _run(self, fn, args):
+        try:
+            fn(*args)
+            self._count('completed')
+        except Exception as e:
+            self._count('failed')
+            logger.warning(f"Prefetch {getattr(fn, '__name__', fn)} failed: {str(e)}")
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        """Job counts for this process, plus the configured capacity"""
+        with self._lock:
+            return dict(self._counts, workers=self.max_workers, max_pending=self.max_pending)
@@ -0,0 +1,159 @@
+"""Opt-in sampling profiler for individual requests.
+
+A request is profiled when it carries an X-Profile header matching
+PROFILE_TOKEN, or when it is picked at random at PROFILE_SAMPLE_RATE. While
+the handler runs, a sampler thread records the handler thread's stack every
+few milliseconds. When the request finishes, two files are written to
+PROFILE_DIR:
+
+- <id>.folded: collapsed stacks, ready for flamegraph.pl or speedscope
+- <id>.json: wall vs. CPU time, with each upstream call's wait time
+
+With neither PROFILE_TOKEN nor PROFILE_SAMPLE_RATE set, no hooks are
+installed at all.
+"""
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from flask import g, has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer into collapsed-stack counts"""
+
+    def __init__(self, thread_id, interval_ms=5):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+
+def _should_profile(token, sample_rate):
+    if token:
+        supplied = request.headers.get(PROFILE_HEADER)
+        # compare_digest rejects non-ASCII str, so compare the encoded bytes
+        if supplied and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8')):
+            return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def _record_upstream(method, path, replica_url, elapsed_ms, status_code):
+    """ReplicaPool listener: attribute upstream waits to the profiled request"""
+    if has_request_context() and 'profile' in g:
+        g.profile['upstream'].append({
+            'method': method,
+            'path': path,
+            'replica': replica_url,
+            'status': status_code,
+            'wall_ms': round(elapsed_ms, 3)
+        })
+
+
+def _write_profile(directory, profile_id, stacks, summary):
+    with open(os.path.join(directory, f'{profile_id}.folded'), 'w') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+    with open(os.path.join(directory, f'{profile_id}.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+
+def init_profiling(app, pool=None, directory='profiles', token=None, sample_rate=0.0, interval_ms=5):
+    """Install the profiling hooks on app. Returns False, and does nothing, when disabled."""
+    if not token and sample_rate <= 0:
+        return False
+
+    os.makedirs(directory, exist_ok=True)
+    if pool is not None:
+        pool.listeners.append(_record_upstream)
+
+    @app.before_request
+    def start_profile():
+        if not _should_profile(token, sample_rate):
+            return
+        sampler = StackSampler(threading.get_ident(), interval_ms)
+        g.profile = {
+            'sampler': sampler,
+            'upstream': [],
+            'wall_start': time.perf_counter(),
+            'cpu_start': time.thread_time()
+        }
+        sampler.start()
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+
+        wall_ms = (time.perf_counter() - profile['wall_start']) * 1000
+        cpu_ms = (time.thread_time() - profile['cpu_start']) * 1000
+        stacks = profile['sampler'].stop()
+        upstream_ms = sum(call['wall_ms'] for call in profile['upstream'])
+
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unknown'}-{uuid.uuid4().hex[:8]}"
+        summary = {
+            'id': profile_id,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'wall_ms': round(wall_ms, 3),
+            'cpu_ms': round(cpu_ms, 3),
+            'upstream_ms': round(upstream_ms, 3),
+            # Wall time not spent on CPU or upstream: locks, GIL, other I/O
+            'other_wait_ms': round(max(wall_ms - cpu_ms - upstream_ms, 0.0), 3),
+            'samples': sum(stacks.values()),
+            'sample_interval_ms': interval_ms,
+            'upstream': profile['upstream']
+        }
+        try:
+            _write_profile(directory, profile_id, stacks, summary)
+            response.headers['X-Profile-Id'] = profile_id
+        except OSError as e:
+            logger.error(f"Failed to write profile {profile_id}: {str(e)}")
+        return response
+
+    @app.teardown_request
+    def abandon_profile(exc):
+        # after_request is skipped when a response could not be built
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile['sampler'].stop()
+
+    logger.info(f"Request profiling enabled, writing to {directory}")
+    return True
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as webapp
+from cache import LRUCache
+
+
+@pytest.fixture
+def app():
+    """The Flask app, for pytest-flask's client fixture"""
+    webapp.app.config['TESTING'] = True
+    return webapp.app
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh in-memory cache in place of the app's shared one"""
+    fresh = LRUCache(max_entries=1024)
+    monkeypatch.setattr(webapp, 'cache', fresh)
+    return fresh
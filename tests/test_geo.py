@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from geo import GridIndex, haversine_km, resolve_location
+
+
+def _points(seed, n=400, nan_every=17):
+    """Random points around New York, some of them unplaced (NaN)"""
+    rng = np.random.default_rng(seed)
+    lats = 40.7 + rng.normal(0, 0.3, n)
+    lons = -74.0 + rng.normal(0, 0.3, n)
+    lats[::nan_every] = np.nan
+    return lats, lons
+
+
+def _brute_force(lats, lons, lat, lon, mask=None):
+    """Indices of every placed point and their distances, nearest first"""
+    distances = haversine_km(lat, lon, lats, lons)
+    keep = ~np.isnan(distances)
+    if mask is not None:
+        keep &= mask
+    ids = np.flatnonzero(keep)
+    order = np.argsort(distances[ids], kind='stable')
+    return ids[order], distances[ids][order]
+
+
+@pytest.mark.parametrize('cell_deg', [0.01, 0.05, 1.0])
+@pytest.mark.parametrize('radius_km', [0.5, 5, 25, 500])
+def test_within_matches_brute_force(cell_deg, radius_km):
+    lats, lons = _points(1)
+    index = GridIndex(lats, lons, cell_deg=cell_deg)
+    for lat, lon in [(40.7, -74.0), (41.5, -73.0), (0.0, 0.0)]:
+        ids, distances = index.within(lat, lon, radius_km)
+        expected_ids, expected = _brute_force(lats, lons, lat, lon)
+        inside = expected <= radius_km
+        assert set(ids.tolist()) == set(expected_ids[inside].tolist())
+        np.testing.assert_allclose(distances, expected[inside])
+
+
+@pytest.mark.parametrize('cell_deg', [0.01, 0.05, 1.0])
+@pytest.mark.parametrize('k', [1, 5, 50, 1000])
+def test_nearest_matches_brute_force(cell_deg, k):
+    lats, lons = _points(2)
+    index = GridIndex(lats, lons, cell_deg=cell_deg)
+    # Near the points, at their edge, and far away (the vectorized scan path)
+    for lat, lon in [(40.7, -74.0), (41.6, -74.9), (34.0, -118.2)]:
+        ids, distances = index.nearest(lat, lon, k)
+        _, expected = _brute_force(lats, lons, lat, lon)
+        np.testing.assert_allclose(distances, expected[:k])
+        np.testing.assert_allclose(haversine_km(lat, lon, lats[ids], lons[ids]), distances)
+
+
+def test_mask_skips_rows():
+    lats, lons = _points(3)
+    mask = np.arange(lats.size) % 3 == 0
+    index = GridIndex(lats, lons)
+    ids, _ = index.within(40.7, -74.0, 30, mask)
+    expected_ids, expected = _brute_force(lats, lons, 40.7, -74.0, mask)
+    assert set(ids.tolist()) == set(expected_ids[expected <= 30].tolist())
+    ids, distances = index.nearest(40.7, -74.0, 10, mask)
+    assert mask[ids].all()
+    np.testing.assert_allclose(distances, expected[:10])
+
+
+def test_empty_index():
+    index = GridIndex([np.nan], [np.nan])
+    assert len(index) == 0
+    assert index.within(40.7, -74.0, 10)[0].size == 0
+    assert index.nearest(40.7, -74.0, 3)[0].size == 0
+
+
+def test_resolve_location_keeps_the_qualifier():
+    assert resolve_location('Portland, OR') == resolve_location('Portland')
+    assert resolve_location('Portland, ME') is None
+    assert resolve_location('Brooklyn, NY, USA') == resolve_location('brooklyn')
+    assert resolve_location('40.5, -73.25') == (40.5, -73.25)
+    assert resolve_location('95, 10') is None
@@ -0,0 +1,79 @@
+import pytest
+
+import app as webapp
+
+
+@pytest.fixture
+def view(cache):
+    """Seed the stats view and return a reader for its current stats"""
+    webapp._reconcile_stats(({
+        'totalUsers': 10,
+        'totalDogs': 4,
+        'owners': 6,
+        'walkers': 4,
+        'breeds': [{'breed': 'Lab', 'count': 3}, {'breed': 'Pug', 'count': 1}],
+        'sizes': [{'size': 'large', 'count': 3}, {'size': 'small', 'count': 1}]
+    }, True))
+    return lambda: cache.get('stats', 'view')['stats']
+
+
+def _counts(buckets, key):
+    return {bucket[key]: bucket['count'] for bucket in buckets}
+
+
+def test_user_added_and_removed_by_role(view):
+    webapp._stats_user_added('walker')
+    webapp._stats_user_added('owner')
+    webapp._stats_user_removed('owner')
+    stats = view()
+    assert (stats['totalUsers'], stats['owners'], stats['walkers']) == (11, 6, 5)
+
+
+def test_user_removed_never_goes_negative(view):
+    for _ in range(6):
+        webapp._stats_user_removed('walker')
+    assert view()['walkers'] == 0
+
+
+def test_dog_added_creates_buckets(view):
+    webapp._stats_dog_changed(None, {'breed': 'Beagle', 'size': 'medium'})
+    stats = view()
+    assert stats['totalDogs'] == 5
+    assert _counts(stats['breeds'], 'breed') == {'Lab': 3, 'Pug': 1, 'Beagle': 1}
+    assert _counts(stats['sizes'], 'size') == {'large': 3, 'small': 1, 'medium': 1}
+
+
+def test_dog_deleted_drops_empty_buckets(view):
+    webapp._stats_dog_changed({'breed': 'Pug', 'size': 'small'}, None)
+    stats = view()
+    assert stats['totalDogs'] == 3
+    assert _counts(stats['breeds'], 'breed') == {'Lab': 3}
+    assert _counts(stats['sizes'], 'size') == {'large': 3}
+
+
+def test_dog_moving_between_buckets_keeps_total(view):
+    webapp._stats_dog_changed({'breed': 'Lab', 'size': 'large'}, {'breed': 'Pug', 'size': 'large'})
+    stats = view()
+    assert stats['totalDogs'] == 4
+    assert _counts(stats['breeds'], 'breed') == {'Lab': 2, 'Pug': 2}
+    assert _counts(stats['sizes'], 'size') == {'large': 3, 'small': 1}
+
+
+def test_every_change_gets_a_new_version(view, cache):
+    before = cache.get('stats', 'version')
+    webapp._stats_user_added('owner')
+    assert cache.get('stats', 'version') == cache.get('stats', 'view')['version'] != before
+
+
+def test_changes_without_a_view_store_nothing(cache):
+    webapp._stats_user_added('owner')
+    webapp._stats_dog_changed(None, {'breed': 'Lab', 'size': 'large'})
+    assert cache.get('stats', 'view') is None
+
+
+def test_partial_snapshot_is_not_stored(view, cache):
+    version = cache.get('stats', 'version')
+    result = webapp._reconcile_stats(({'totalUsers': 0}, False))
+    assert result['version'] is None
+    assert cache.get('stats', 'version') == version
+    assert view()['totalUsers'] == 10
@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+import pytest
+
+import app as webapp
+
+LOCATIONS = ['Brooklyn, NY', 'Brooklyn Heights, NY', 'Queens, NY', 'Jersey City, NJ', 'Portland, ME', '']
+
+
+@pytest.fixture(scope='module')
+def walkers():
+    rng = random.Random(7)
+    return [{
+        'id': i,
+        'name': f'Walker {i}',
+        'rating': round(rng.uniform(2, 5), 1),
+        'total_reviews': rng.randint(0, 200),
+        'location': rng.choice(LOCATIONS),
+        'price': rng.choice([0, None, 15, 20, 25, 40])
+    } for i in range(300)]
+
+
+@pytest.fixture(scope='module')
+def columns(walkers):
+    return webapp._build_walker_columns(walkers)
+
+
+def _expected(columns, sort, limit, location=None, min_rating=None):
+    """Brute force: filter, score and fully sort every walker"""
+    scores = webapp._score_walkers(columns, sort, location)
+    keep = [i for i, walker in enumerate(columns['records'])
+            if (min_rating is None or columns['rating'][i] >= min_rating) and
+            (not location or location.lower() in (walker['location'] or '').lower())]
+    ordered = sorted(keep, key=lambda i: -scores[i])
+    return [scores[i] for i in ordered[:limit]], len(keep)
+
+
+@pytest.mark.parametrize('sort', webapp.WALKER_SORT_OPTIONS)
+@pytest.mark.parametrize('limit', [1, 10, 1000])
+@pytest.mark.parametrize('location,min_rating', [(None, None), (None, 4.0), ('brooklyn', None), ('Queens', 3.5)])
+def test_top_k_matches_full_sort(columns, sort, limit, location, min_rating):
+    ranked, distances, matched = webapp._rank_walkers(
+        columns, sort, limit, location=location, min_rating=min_rating
+    )
+    scores = webapp._score_walkers(columns, sort, location)
+    expected_scores, expected_matched = _expected(columns, sort, limit, location, min_rating)
+    assert distances is None
+    assert matched == expected_matched
+    np.testing.assert_allclose([scores[walker['id']] for walker in ranked], expected_scores)
+
+
+def test_filters_apply_to_every_result(columns):
+    ranked, _, _ = webapp._rank_walkers(columns, 'best', 50, location='brooklyn', min_rating=4.0)
+    assert ranked
+    for walker in ranked:
+        assert 'brooklyn' in walker['location'].lower() and walker['rating'] >= 4.0
+
+
+def test_location_radius_keeps_unplaced_text_matches(columns):
+    origin = webapp.resolve_location('Brooklyn')
+    ranked, distances, matched = webapp._rank_walkers(
+        columns, None, 1000, location='Brooklyn', origin=origin, radius_km=1
+    )
+    by_location = {walker['location'] for walker in ranked}
+    assert by_location == {'Brooklyn, NY', 'Brooklyn Heights, NY'}
+    assert matched == len(ranked)
+    # Placed walkers first, nearest first; unplaced ones have no distance
+    placed = [d for d in distances if not np.isnan(d)]
+    assert placed == sorted(placed) and np.isnan(distances[-1])
+
+
+def test_nearest_without_radius(columns):
+    ranked, distances, matched = webapp._rank_walkers(
+        columns, None, 5, origin=webapp.resolve_location('Queens')
+    )
+    assert matched == 5 and distances == sorted(distances)
+    assert {walker['location'] for walker in ranked} == {'Queens, NY'}
+
+
+def test_price_fallback_matches_display(walkers, columns):
+    for i, walker in enumerate(walkers):
+        assert columns['price'][i] == webapp._format_walker(walker)['price']
@@ -0,0 +1,289 @@
+"""Client-side load balancing across user service replicas.
+
+ReplicaPool sends each request to one replica. It picks by least outstanding
+requests or by peak-EWMA latency. A replica is ejected for a cooldown after
+repeated failures or a failed health probe.
+
+The blocking methods use requests; the a-prefixed coroutines (aget, apost,
+...) use httpx when it is installed and share the same replica bookkeeping.
+"""
+import asyncio
+import math
+import random
+import threading
+import time
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # only needed by the asyncio serving mode
+    httpx = None
+
+BALANCE_POLICIES = ('least_outstanding', 'peak_ewma')
+
+
+class Replica:
+    """One upstream base URL and its live traffic/latency/health numbers"""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ewma_ms = 0.0
+        self.last_sample_at = None
+        self.ejected_until = 0.0
+
+    def available(self, now):
+        return now >= self.ejected_until
+
+    def observe_latency(self, latency_ms, decay_ms):
+        """Peak-EWMA: jump straight to slower samples, decay toward faster ones"""
+        now = time.monotonic()
+        if self.last_sample_at is None or latency_ms > self.ewma_ms:
+            self.ewma_ms = latency_ms
+        else:
+            elapsed_ms = (now - self.last_sample_at) * 1000
+            weight = math.exp(-elapsed_ms / decay_ms)
+            self.ewma_ms = self.ewma_ms * weight + latency_ms * (1 - weight)
+        self.last_sample_at = now
+
+    def snapshot(self, now):
+        return {
+            'url': self.url,
+            'status': 'healthy' if self.available(now) else 'ejected',
+            'outstanding': self.outstanding,
+            'requests': self.requests,
+            'failures': self.failures,
+            'ewma_latency_ms': round(self.ewma_ms, 2)
+        }
+
+
+class ReplicaPool:
+    """Pick a replica per request and track how each one is doing.
+
+    All replicas share one pooled requests.Session, or one httpx.AsyncClient
+    per event loop for the coroutines. When every replica is ejected the pool
+    fails open and uses all of them again. async_max_connections caps each
+    AsyncClient's open connections; None leaves it unbounded, so thousands of
+    concurrent calls wait on the upstream rather than on the pool.
+    """
+
+    def __init__(self, urls, policy='peak_ewma', max_failures=3, eject_seconds=30,
+                 decay_ms=10000, health_path='/health', health_interval=0,
+                 async_max_connections=None):
+        if policy not in BALANCE_POLICIES:
+            raise ValueError(f'Unknown balance policy: {policy}')
+        if not urls:
+            raise ValueError('At least one replica URL is required')
+        self.replicas = [Replica(url) for url in urls]
+        self.policy = policy
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self.decay_ms = decay_ms
+        self.health_path = health_path
+        self.health_interval = health_interval
+        self.async_max_connections = async_max_connections
+        self.session = requests.Session()
+        self._async_clients = {}
+        # Callables run after every request as
+        # listener(method, path, replica_url, elapsed_ms, status_code or None)
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._prober = None
+
+    @property
+    def urls(self):
+        return [replica.url for replica in self.replicas]
+
+    def _cost(self, replica):
+        if self.policy == 'least_outstanding':
+            return (replica.outstanding, replica.ewma_ms)
+        # Unmeasured replicas look free so they get sampled
+        return ((replica.ewma_ms or 0.0) * (replica.outstanding + 1), replica.outstanding)
+
+    def pick(self):
+        """Choose the cheapest available replica, breaking ties at random"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [r for r in self.replicas if r.available(now)] or self.replicas
+            best = min(self._cost(r) for r in candidates)
+            return random.choice([r for r in candidates if self._cost(r) == best])
+
+    def _record_failure(self, replica):
+        with self._lock:
+            replica.failures += 1
+            replica.consecutive_failures += 1
+            if replica.consecutive_failures >= self.max_failures:
+                replica.ejected_until = time.monotonic() + self.eject_seconds
+
+    def _begin(self):
+        replica = self.pick()
+        with self._lock:
+            replica.outstanding += 1
+            replica.requests += 1
+        return replica, time.perf_counter()
+
+    def _release(self, replica):
+        with self._lock:
+            replica.outstanding -= 1
+
+    def _fail(self, method, path, replica, started):
+        self._record_failure(replica)
+        self._notify(method, path, replica, (time.perf_counter() - started) * 1000, None)
+
+    def _finish(self, method, path, replica, started, status_code):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            replica.observe_latency(elapsed_ms, self.decay_ms)
+        self._notify(method, path, replica, elapsed_ms, status_code)
+        if status_code >= 500:
+            self._record_failure(replica)
+        else:
+            with self._lock:
+                replica.consecutive_failures = 0
+
+    def request(self, method, path, **kwargs):
+        """Send one request to a chosen replica. Raises RequestException like requests does."""
+        self._ensure_prober()
+        replica, started = self._begin()
+        try:
+            response = self.session.request(method, f'{replica.url}{path}', **kwargs)
+        except requests.exceptions.RequestException:
+            self._fail(method, path, replica, started)
+            raise
+        finally:
+            self._release(replica)
+        self._finish(method, path, replica, started, response.status_code)
+        return response
+
+    def async_client(self):
+        """The pooled httpx.AsyncClient for the running event loop"""
+        if httpx is None:
+            raise RuntimeError('httpx is required for the async upstream client')
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.async_max_connections,
+                                    max_keepalive_connections=100)
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """Close the running loop's async client, e.g. on server shutdown"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def arequest(self, method, path, **kwargs):
+        """Coroutine version of request(). Raises httpx.HTTPError instead of RequestException."""
+        client = self.async_client()
+        self._ensure_prober()
+        replica, started = self._begin()
+        try:
+            response = await client.request(method, f'{replica.url}{path}', **kwargs)
+        except httpx.HTTPError:
+            self._fail(method, path, replica, started)
+            raise
+        finally:
+            self._release(replica)
+        self._finish(method, path, replica, started, response.status_code)
+        return response
+
+    def _notify(self, method, path, replica, elapsed_ms, status_code):
+        for listener in self.listeners:
+            listener(method, path, replica.url, elapsed_ms, status_code)
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    async def aget(self, path, **kwargs):
+        return await self.arequest('GET', path, **kwargs)
+
+    async def apost(self, path, **kwargs):
+        return await self.arequest('POST', path, **kwargs)
+
+    async def aput(self, path, **kwargs):
+        return await self.arequest('PUT', path, **kwargs)
+
+    async def adelete(self, path, **kwargs):
+        return await self.arequest('DELETE', path, **kwargs)
+
+    def mark_health(self, replica, healthy):
+        """Feed a health probe result: an unhealthy replica is ejected for eject_seconds"""
+        with self._lock:
+            if healthy:
+                replica.consecutive_failures = 0
+                replica.ejected_until = 0.0
+            else:
+                replica.ejected_until = time.monotonic() + self.eject_seconds
+
+    def probe(self, timeout=5):
+        """Probe every replica's health endpoint and update its status.
+
+        Returns {url: (status, error)} where status is 'healthy', 'unhealthy'
+        or 'unavailable'.
+        """
+        results = {}
+        for replica in self.replicas:
+            try:
+                response = self.session.get(f'{replica.url}{self.health_path}', timeout=timeout)
+                healthy = response.status_code == 200
+                results[replica.url] = ('healthy' if healthy else 'unhealthy', None)
+            except requests.exceptions.RequestException as e:
+                healthy = False
+                results[replica.url] = ('unavailable', str(e))
+            self.mark_health(replica, healthy)
+        return results
+
+    async def aprobe(self, timeout=5):
+        """Coroutine version of probe(): all replicas are probed concurrently"""
+        client = self.async_client()
+
+        async def probe_one(replica):
+            try:
+                response = await client.get(f'{replica.url}{self.health_path}', timeout=timeout)
+                healthy = response.status_code == 200
+                result = ('healthy' if healthy else 'unhealthy', None)
+            except httpx.HTTPError as e:
+                healthy = False
+                result = ('unavailable', str(e))
+            self.mark_health(replica, healthy)
+            return result
+
+        results = await asyncio.gather(*(probe_one(replica) for replica in self.replicas))
+        return dict(zip(self.urls, results))
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.health_interval)
+            self.probe()
+
+    def _ensure_prober(self):
+        if self.health_interval <= 0 or self._prober is not None:
+            return
+        with self._lock:
+            if self._prober is None:
+                self._prober = threading.Thread(
+                    target=self._probe_loop, name='upstream-health-probe', daemon=True
+                )
+                self._prober.start()
+
+    def snapshot(self):
+        """Per-replica traffic, latency and health for reporting"""
+        now = time.monotonic()
+        with self._lock:
+            return [replica.snapshot(now) for replica in self.replicas]